@@ -9,6 +9,12 @@ const requestCounts = new Map();
 const RATE_LIMIT = 20; // requests per minute per IP
 const RATE_WINDOW = 60000; // 1 minute in ms
 
+// Clip formats, in lookup order (matches CLIP_EXTS in tools/common.py)
+const CLIP_FORMATS = [
+  { ext: '.mp3', type: 'audio/mpeg' },
+  { ext: '.m4a', type: 'audio/mp4' },
+];
+
 function getRateLimitKey(ip) {
   return ip;
 }
@@ -86,19 +92,24 @@ export default function handler(req, res) {
   }
 
   try {
-    // Construct file path safely
+    // Construct file path safely. A clip is <id>.mp3, or <id>.m4a when the
+    // downloader stream-copied an AAC source instead of re-encoding it.
     const audioDir = path.join(__dirname, '..', 'public', 'audio');
-    const filePath = path.join(audioDir, `${id}.mp3`);
+    const clip = CLIP_FORMATS
+      .map(({ ext, type }) => ({ filePath: path.join(audioDir, `${id}${ext}`), type }))
+      .find(({ filePath }) => fs.existsSync(filePath));
 
-    // Verify file is within audio directory (prevent directory traversal)
-    if (!filePath.startsWith(audioDir)) {
-      res.status(403).json({ error: 'Access denied' });
+    // Check if file exists
+    if (!clip) {
+      res.status(404).json({ error: 'Audio file not found' });
       return;
     }
 
-    // Check if file exists
-    if (!fs.existsSync(filePath)) {
-      res.status(404).json({ error: 'Audio file not found' });
+    const { filePath, type: contentType } = clip;
+
+    // Verify file is within audio directory (prevent directory traversal)
+    if (!filePath.startsWith(audioDir)) {
+      res.status(403).json({ error: 'Access denied' });
       return;
     }
 
@@ -118,7 +129,7 @@ export default function handler(req, res) {
         'Content-Range': `bytes ${start}-${end}/${fileSize}`,
         'Accept-Ranges': 'bytes',
         'Content-Length': chunksize,
-        'Content-Type': 'audio/mpeg',
+        'Content-Type': contentType,
         'Cache-Control': 'public, max-age=31536000' // Cache for 1 year
       });
 
@@ -126,7 +137,7 @@ export default function handler(req, res) {
     } else {
       res.writeHead(200, {
         'Content-Length': fileSize,
-        'Content-Type': 'audio/mpeg',
+        'Content-Type': contentType,
         'Accept-Ranges': 'bytes',
         'Cache-Control': 'public, max-age=31536000' // Cache for 1 year
       });
@@ -10,7 +10,7 @@
 import { ref, watch } from 'vue'
 
 import settings from '@/settings/settings.json'
-import music from '@/settings/music.json'
+import { songs as music } from '@/songs'
 
 export function ParseStringWithVariable(string) {
     let nString = "";
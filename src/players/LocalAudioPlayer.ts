@@ -5,17 +5,37 @@ export class LocalAudioPlayer extends Player {
     Playing: boolean
     Volume: number
     startSeconds: number
+    // Level-matching factor and waveform peaks (drawn over the progress bar by
+    // TransportBar) from the clip's precomputed sidecar (tools/analyze_audio.py).
+    // Both stay neutral until it arrives.
+    gain: number
+    peaks: number[] | null
 
-    constructor(url: string) {
+    constructor(url: string, fallbackUrls: string[] = []) {
         super(url);
         
         this.audio = new Audio();
         this.audio.crossOrigin = "anonymous";
         this.audio.src = url; // url should be like "/api/audio?id=song-1"
+
+        // Try each fallback in turn if the source fails to load, e.g. a clip
+        // that was stream-copied to .m4a when served straight from /audio/.
+        const fallbacks = [...fallbackUrls];
+        const onError = () => {
+            const next = fallbacks.shift();
+            if (next === undefined) {
+                this.audio.removeEventListener('error', onError);
+                return;
+            }
+            this.audio.src = next;
+        };
+        this.audio.addEventListener('error', onError);
         
         this.Playing = false;
         this.Volume = 50;
         this.startSeconds = 0;
+        this.gain = 1;
+        this.peaks = null;
 
         // Update playing state
         this.audio.addEventListener('play', () => {
@@ -37,6 +57,35 @@ export class LocalAudioPlayer extends Player {
         this.audio.volume = this.Volume / 100;
     }
 
+    /**
+     * Fetch the clip's analysis sidecar and apply its suggested gain and
+     * start offset (which skips a silent intro).
+     *
+     * The sidecar is a few hundred bytes, so this is far cheaper than decoding
+     * the clip in the browser. It is optional: a missing or malformed sidecar
+     * just leaves the clip at its original level.
+     */
+    async LoadClipData(metaUrl: string): Promise<void> {
+        try {
+            const response = await fetch(metaUrl);
+            if (!response.ok) return;
+            const meta = await response.json();
+
+            if (Array.isArray(meta.peaks)) this.peaks = meta.peaks;
+            if (typeof meta.gain_db === 'number') {
+                // HTMLAudio can only attenuate, so positive gains clamp to 1.
+                this.gain = Math.min(1, Math.pow(10, meta.gain_db / 20));
+                this.audio.volume = (this.Volume / 100) * this.gain;
+            }
+            if (typeof meta.start === 'number' && meta.start > 0 && !this.Playing) {
+                this.startSeconds = meta.start;
+                this.audio.currentTime = meta.start;
+            }
+        } catch (e) {
+            console.log('Clip data unavailable:', e);
+        }
+    }
+
     private updateMediaSession(): void {
         if ('mediaSession' in navigator) {
             const baseUrl = window.location.origin;
@@ -157,7 +206,7 @@ export class LocalAudioPlayer extends Player {
 
     override SetVolume(volume: number): void {
         this.Volume = volume;
-        this.audio.volume = volume / 100;
+        this.audio.volume = (volume / 100) * this.gain;
     }
 
     override Destroy(): void {
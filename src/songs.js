@@ -0,0 +1,118 @@
+// The song catalog as the page sees it, and autocomplete over it.
+//
+// Built from music.json by tools/build_songs.py (run `python -m tools songs`
+// after editing music.json). The bundled songs.json carries only what is needed
+// before the game ends -- display title, album and id -- plus a precomputed
+// token index, so nothing is indexed at load. Each song's YouTube URL and album
+// art live in public/songs/<id>.json and are fetched only for the reveal.
+
+import data from '@/settings/songs.json'
+
+/** Every song as {title, album, id}, in music.json order (the rotation relies on it). */
+export const songs = data.songs.map(([title, album, id]) => ({ title, album: data.albums[album], id }));
+
+/**
+ * Split text into search tokens. Must stay in step with tokens() in
+ * tools/build_songs.py: accents stripped, lowercased, apostrophes dropped,
+ * "&" read as "and", and anything else that is not a letter or digit a break.
+ */
+export function normalize(text) {
+    return text
+        .normalize('NFKD')
+        .replace(/[\u0300-\u036f]/g, '')
+        .toLowerCase()
+        .replace(/['\u2019]/g, '')
+        .replace(/&/g, ' and ')
+        .split(/[^a-z0-9]+/)
+        .filter(Boolean);
+}
+
+/** Index of the first token >= prefix in the sorted token list. */
+function lowerBound(prefix) {
+    let lo = 0, hi = data.tokens.length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (data.tokens[mid] < prefix) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+/** Merge the postings of token i into `found` (song index -> 0 for a title hit, 1 for album only). */
+function addPostings(found, i) {
+    for (const p of data.postings[i]) {
+        const song = p >= 0 ? p : ~p;
+        const cost = p >= 0 ? 0 : 1;
+        if (!found.has(song) || cost < found.get(song)) found.set(song, cost);
+    }
+}
+
+/** Songs with a token starting with `word`. */
+function prefixMatches(word) {
+    const found = new Map();
+    for (let i = lowerBound(word); i < data.tokens.length && data.tokens[i].startsWith(word); i++) {
+        addPostings(found, i);
+    }
+    return found;
+}
+
+/** Songs with a token containing `word` anywhere: a scan of the whole vocabulary. */
+function substringMatches(word) {
+    const found = new Map();
+    data.tokens.forEach((token, i) => {
+        if (token.includes(word)) addPostings(found, i);
+    });
+    return found;
+}
+
+/** Song indexes matching every word, with their summed album-only cost. */
+function score(words, matches) {
+    let scores = null;
+    for (const word of words) {
+        const found = matches(word);
+        const next = new Map();
+        for (const [song, cost] of found) {
+            if (scores === null) next.set(song, cost);
+            else if (scores.has(song)) next.set(song, scores.get(song) + cost);
+        }
+        scores = next;
+        if (scores.size === 0) break;
+    }
+    return scores;
+}
+
+/**
+ * Songs matching every word of `query` by prefix, in title or album. If no
+ * song does, words may match anywhere inside a word instead ("onely" finds
+ * "Lonely"), so a guess that starts mid-word still gets suggestions. Letters
+ * out of order or skipped are not matched.
+ *
+ * Songs whose title matches more of the words come first, then shorter titles
+ * (the closer match), then catalog order. An empty query lists everything.
+ */
+export function searchSongs(query) {
+    const words = normalize(query);
+    if (words.length === 0) return songs.slice();
+
+    let scores = score(words, prefixMatches);
+    if (scores.size === 0) scores = score(words, substringMatches);
+
+    return [...scores.entries()]
+        .sort((a, b) => a[1] - b[1] || songs[a[0]].title.length - songs[b[0]].title.length || a[0] - b[0])
+        .map(([song]) => songs[song]);
+}
+
+const details = new Map();
+
+/**
+ * The post-game details for a song: {url, art}. Fetched once per id; resolves
+ * to an empty object if the file is missing, so callers can just test fields.
+ */
+export function loadSongDetails(id) {
+    if (!details.has(id)) {
+        details.set(id, fetch(`/songs/${id}.json`)
+            .then((response) => response.ok ? response.json() : {})
+            .catch(() => ({})));
+    }
+    return details.get(id);
+}
@@ -0,0 +1,7 @@
+"""
+Catalog and audio tooling for the Heardle.
+
+Run `python -m tools --help` for the unified command line. Importing this
+package (or tools.common) is deliberately cheap: heavy dependencies such as
+yt-dlp, requests and numpy are only imported by the subcommand that needs them.
+"""
@@ -0,0 +1,64 @@
+"""
+Unified entry point for the tools:  python -m tools <command> [options]
+
+Each command lives in its own module, imported only when that command runs, so
+`python -m tools --help` never pays for yt-dlp, requests or numpy. Options after
+the command are passed straight to it; `python -m tools <command> --help` shows
+them.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+# name -> (module, leading argv for its main(), one-line help)
+COMMANDS = {
+    "sync": ("sync_music", [], "add newly released songs to music.json"),
+    "verify": ("sync_music", ["--verify"], "check every music.json URL still plays"),
+    "repair": ("sync_music", ["--repair"], "find replacement URLs for dead videos"),
+    "art": ("scrape_deezer", [], "refresh album art URLs from Deezer"),
+    "download": ("download_audio", [], "download missing clips to public/audio/"),
+    "validate": ("validate_music", [], "check music.json for broken entries"),
+    "songs": ("build_songs", [], "rebuild the frontend song data from music.json"),
+    "recut": ("recut", [], "re-cut changed clips from cached source audio"),
+    "analyze": ("analyze_audio", [], "precompute clip loudness and waveform peaks"),
+    "daemon": ("daemon", [], "run sync/verify/repair/download on a schedule"),
+    "queue": ("workqueue", [], "shard verify/download across workers and hosts"),
+    "deploy": ("deploy_prep", [], "list clips changed since the last deploy"),
+}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools",
+        description="Catalog and audio tools for the Heardle.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="commands:\n"
+        + "\n".join(f"  {name:<10} {help}" for name, (_, _, help) in COMMANDS.items()),
+    )
+    ap.add_argument("--record", metavar="ZIP", help="record all network results to ZIP")
+    ap.add_argument("--replay", metavar="ZIP", help="replay network results from ZIP")
+    ap.add_argument("--latency", metavar="MS", help="replay latency per call, in ms")
+    ap.add_argument("command", choices=COMMANDS, metavar="command")
+    ap.add_argument("args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    # tools.transport reads these when first imported, which is below.
+    if args.record:
+        os.environ["HEARDLE_TRANSPORT"] = f"record:{args.record}"
+    if args.replay:
+        os.environ["HEARDLE_TRANSPORT"] = f"replay:{args.replay}"
+    if args.latency:
+        os.environ["HEARDLE_LATENCY_MS"] = args.latency
+
+    module, lead, _ = COMMANDS[args.command]
+    return importlib.import_module(f"tools.{module}").main([*lead, *args.args])
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Cancelled")
+        sys.exit(130)
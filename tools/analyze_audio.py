@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Sam Bowman Heardle - Clip Analysis
+
+Decodes every clip in public/audio/ (.mp3 or stream-copied .m4a) once and
+writes a small sidecar per clip to public/audio-meta/<id>.json, so the browser
+never has to decode audio just to draw the progress bar, level-match songs or
+skip a silent intro:
+
+    {"v": 2, "peaks": [0-255 x PEAK_BINS], "lufs": -9.8, "peak_db": -0.3,
+     "gain_db": -8.2, "start": 1.35}
+
+  peaks     downsampled absolute peaks across the clip window, scaled so the
+            loudest bin is 255. The window is the longest unlock time in
+            settings.json, so bin i always covers the same seconds in every clip.
+  lufs      integrated loudness (ITU-R BS.1770: K-weighted, 400 ms blocks,
+            absolute -70 LUFS and relative -10 LU gates)
+  gain_db   what to apply to reach TARGET_LUFS without pushing the sample peak
+            above PEAK_CEILING_DB. The player can only attenuate (HTMLAudio
+            volume tops out at 1.0), so the target sits below typical masters
+            and the gain is almost always negative.
+  start     recommended playback offset in seconds: the end of any leading
+            silence or fade-in below SILENCE_DB, less a short pre-roll. A
+            1-second first guess that starts at 0 would otherwise often play
+            nothing at all. 0 when the clip opens with sound.
+
+Clips are analysed in batches spread over a process pool. Each worker decodes
+its batch with ffmpeg, zero-pads it into one array, and does the K-weighting,
+loudness gating and 50 ms frame RMS with NumPy across the whole batch at once.
+
+Every run ends with a report of clips whose first unlock windows are mostly
+silent, and of any near-silent stretch longer than GAP_SECONDS. With --recut,
+clips with a recommended start are trimmed in place (stream copy, no
+re-encode) so the silence is not stored or served at all; a trimmed clip is
+that much shorter at the end.
+
+The run is incremental. Each clip's SHA-256 and results are remembered in
+tools/.cache/analysis.json, and a clip whose bytes have not changed and whose
+sidecar exists is skipped.
+
+USAGE
+
+    python -m tools analyze                  # analyse new/changed clips
+    python tools/analyze_audio.py            # same, run directly
+    python tools/analyze_audio.py --force    # re-analyse everything
+    python -m tools analyze --recut          # also trim leading silence off clips
+
+REQUIREMENTS
+    numpy (pip install numpy)
+    ffmpeg on PATH
+"""
+
+import argparse
+import hashlib
+import json
+import shutil
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/analyze_audio.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.common import AUDIO_DIR, META_DIR, list_clips, load_settings, load_state, update_state
+
+# --- Configuration -----------------------------------------------------------
+
+# Decoding at 22.05 kHz halves the work versus 44.1 kHz; everything above
+# 11 kHz contributes next to nothing to K-weighted loudness or to a 100-bin
+# peak envelope.
+SAMPLE_RATE = 22050
+PEAK_BINS = 100
+TARGET_LUFS = -18.0
+PEAK_CEILING_DB = -1.0
+SIDECAR_VERSION = 2
+
+# Silence detection works on FRAME_SECONDS frames. A frame whose RMS is below
+# SILENCE_DB counts as silent; a leading silence shorter than MIN_START_OFFSET
+# is left alone, and a recommended start keeps PRE_ROLL of it so the first
+# note is not clipped.
+FRAME_SECONDS = 0.05
+SILENCE_DB = -45.0
+MIN_START_OFFSET = 0.25
+PRE_ROLL = 0.1
+GAP_SECONDS = 1.0
+
+# How many of the first unlock windows to check, and the silent fraction at
+# which a window is reported.
+REPORT_WINDOWS = 2
+MOSTLY_SILENT = 0.5
+
+
+# --- Decoding ----------------------------------------------------------------
+
+
+def check_dependencies():
+    """Return the numpy module, or exit with install instructions."""
+    try:
+        import numpy
+    except ImportError:
+        print("❌ numpy is not installed\n\nInstall it with:\n  pip install numpy")
+        sys.exit(1)
+    if not shutil.which("ffmpeg"):
+        print("❌ ffmpeg not found on PATH. Install it: https://ffmpeg.org/download.html")
+        sys.exit(1)
+    return numpy
+
+
+def decode(path, np, seconds):
+    """Decode a clip to a (2, samples) float32 array, at most `seconds` long."""
+    proc = subprocess.run(
+        [
+            "ffmpeg", "-v", "error", "-i", str(path), "-t", str(seconds),
+            "-ac", "2", "-ar", str(SAMPLE_RATE), "-f", "f32le", "-",
+        ],
+        capture_output=True,
+        timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.decode("utf-8", "replace").strip()[:200])
+    return np.frombuffer(proc.stdout, dtype="<f4").reshape(-1, 2).T
+
+
+def sha256(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+# --- Analysis ----------------------------------------------------------------
+
+
+def _biquad_response(np, b, a, w):
+    """Complex frequency response of one biquad at angular frequencies w."""
+    z = np.exp(-1j * w)
+    return (b[0] + b[1] * z + b[2] * z * z) / (a[0] + a[1] * z + a[2] * z * z)
+
+
+def k_weighting(np, n):
+    """
+    BS.1770 K-weighting magnitude response for an rfft of length n.
+
+    The standard publishes coefficients for 48 kHz only; these are the same two
+    stages (high-shelf +4 dB at 1.5 kHz, high-pass at 38 Hz) re-derived for
+    SAMPLE_RATE with the RBJ cookbook formulas. Filtering in the frequency
+    domain is zero-phase, which changes block timing by a few milliseconds but
+    not block energy.
+    """
+    w = 2 * np.pi * np.fft.rfftfreq(n, 1 / SAMPLE_RATE) / SAMPLE_RATE
+
+    A = 10 ** (4.0 / 40)
+    w0 = 2 * np.pi * 1500 / SAMPLE_RATE
+    cos, alpha = np.cos(w0), np.sin(w0) / (2 * 0.7071)
+    shelf = _biquad_response(
+        np,
+        (
+            A * ((A + 1) + (A - 1) * cos + 2 * np.sqrt(A) * alpha),
+            -2 * A * ((A - 1) + (A + 1) * cos),
+            A * ((A + 1) + (A - 1) * cos - 2 * np.sqrt(A) * alpha),
+        ),
+        (
+            (A + 1) - (A - 1) * cos + 2 * np.sqrt(A) * alpha,
+            2 * ((A - 1) - (A + 1) * cos),
+            (A + 1) - (A - 1) * cos - 2 * np.sqrt(A) * alpha,
+        ),
+        w,
+    )
+
+    w0 = 2 * np.pi * 38 / SAMPLE_RATE
+    cos, alpha = np.cos(w0), np.sin(w0) / (2 * 0.5)
+    highpass = _biquad_response(
+        np,
+        ((1 + cos) / 2, -(1 + cos), (1 + cos) / 2),
+        (1 + alpha, -2 * cos, 1 - alpha),
+        w,
+    )
+    return np.abs(shelf * highpass).astype("float32")
+
+
+def analyse_batch(np, clips, seconds, windows=()):
+    """
+    Analyse a batch of decoded clips at once.
+
+    `clips` is a list of (2, samples) arrays of varying length; `windows` are
+    unlock times (seconds) to measure the silent fraction of. Returns one
+    (sidecar, details) pair per clip: the sidecar dict is what the browser
+    fetches, details holds lead/stretches/windows for the report.
+    """
+    n = int(seconds * SAMPLE_RATE)
+    n -= n % PEAK_BINS
+    lengths = np.array([min(c.shape[1], n) for c in clips])
+    batch = np.zeros((len(clips), 2, n), dtype="float32")
+    for i, c in enumerate(clips):
+        batch[i, :, : lengths[i]] = c[:, :n]
+
+    # Peaks: max |sample| over both channels, per bin, scaled to the clip max.
+    env = np.abs(batch).max(axis=1).reshape(len(clips), PEAK_BINS, -1).max(axis=2)
+    top = env.max(axis=1, keepdims=True)
+    peaks = np.round(255 * env / np.where(top > 0, top, 1)).astype(int)
+    peak_db = 20 * np.log10(np.maximum(top[:, 0], 1e-9))
+
+    # K-weight every channel of every clip with one rfft/irfft pair.
+    weighted = np.fft.irfft(np.fft.rfft(batch, axis=2) * k_weighting(np, n), n=n, axis=2)
+
+    # Mean square of every 400 ms block (100 ms hop) from a running sum, summed
+    # over channels (BS.1770 weights L and R at 1.0).
+    block, hop = int(0.4 * SAMPLE_RATE), int(0.1 * SAMPLE_RATE)
+    csum = np.concatenate(
+        [np.zeros((len(clips), 1)), np.cumsum((weighted**2).sum(axis=1), axis=1)], axis=1
+    )
+    starts = np.arange(0, n - block + 1, hop)
+    ms = np.maximum((csum[:, starts + block] - csum[:, starts]) / block, 1e-12)
+    valid = starts[None, :] + block <= lengths[:, None]
+
+    loud = -0.691 + 10 * np.log10(ms)
+    gated = valid & (loud > -70)
+    rel = -0.691 + 10 * np.log10(_masked_mean(np, ms, gated)) - 10
+    gated &= loud > rel[:, None]
+    lufs = -0.691 + 10 * np.log10(_masked_mean(np, ms, gated))
+    lufs[gated.sum(axis=1) == 0] = np.nan  # nothing above the absolute gate
+
+    gain = np.minimum(TARGET_LUFS - lufs, PEAK_CEILING_DB - peak_db)
+
+    # Silence: RMS of every 50 ms frame (power averaged over both channels).
+    # Padding past the end of a short clip counts as silent for the window
+    # fractions -- nothing plays there -- but never as part of a stretch.
+    frame = int(FRAME_SECONDS * SAMPLE_RATE)
+    nf = n // frame
+    power = (batch[:, :, : nf * frame] ** 2).mean(axis=1).reshape(len(clips), nf, frame).mean(axis=2)
+    quiet = 10 * np.log10(np.maximum(power, 1e-12)) < SILENCE_DB
+    in_clip = np.arange(nf)[None, :] * frame < lengths[:, None]
+    sounding = ~quiet & in_clip
+
+    lead = np.where(sounding.any(axis=1), sounding.argmax(axis=1), 0) * FRAME_SECONDS
+    start = np.where(lead >= MIN_START_OFFSET, np.maximum(lead - PRE_ROLL, 0), 0)
+    window_silence = [
+        (quiet | ~in_clip)[:, : max(1, int(t / FRAME_SECONDS))].mean(axis=1) for t in windows
+    ]
+
+    # Runs of silent in-clip frames, found for the whole batch with one diff:
+    # +1 marks a run start, -1 a run end, and both come out of argwhere in the
+    # same row-major order, so starts and ends pair up. A run from frame 0 is
+    # the leading silence, already covered by `start`.
+    edges = np.diff(np.pad((quiet & in_clip).astype(np.int8), ((0, 0), (1, 1))), axis=1)
+    stretches = [[] for _ in clips]
+    for (row, a), (_, b) in zip(np.argwhere(edges == 1), np.argwhere(edges == -1)):
+        if a and (b - a) * FRAME_SECONDS >= GAP_SECONDS:
+            stretches[row].append([round(float(a * FRAME_SECONDS), 2), round(float(b * FRAME_SECONDS), 2)])
+
+    out = []
+    for i in range(len(clips)):
+        silent = not np.isfinite(lufs[i])
+        sidecar = {
+            "v": SIDECAR_VERSION,
+            "peaks": peaks[i].tolist(),
+            "lufs": None if silent else round(float(lufs[i]), 1),
+            "peak_db": round(float(peak_db[i]), 1),
+            "gain_db": 0.0 if silent else round(float(gain[i]), 1),
+            "start": round(float(start[i]), 2),
+        }
+        details = {
+            "lead": round(float(lead[i]), 2),
+            "stretches": stretches[i],
+            "windows": [round(float(w[i]), 2) for w in window_silence],
+        }
+        out.append((sidecar, details))
+    return out
+
+
+def _masked_mean(np, values, mask):
+    """Row-wise mean of `values` where `mask`; 1e-12 for rows with no hits."""
+    count = mask.sum(axis=1)
+    total = np.where(mask, values, 0).sum(axis=1)
+    return np.where(count > 0, total / np.maximum(count, 1), 1e-12)
+
+
+# --- Workers -----------------------------------------------------------------
+
+
+def analyse_files(paths, seconds, windows):
+    """
+    Process-pool worker: decode and analyse one batch of clip files.
+
+    Returns [(path, (sidecar, details) or None)], None for clips ffmpeg could
+    not decode.
+    """
+    import numpy as np
+
+    decoded = [_try_decode(p, np, seconds) for p in paths]
+    ok = [(p, pcm) for p, pcm in zip(paths, decoded) if pcm is not None]
+    results = analyse_batch(np, [pcm for _, pcm in ok], seconds, windows) if ok else []
+    by_path = {p: r for (p, _), r in zip(ok, results)}
+    return [(p, by_path.get(p)) for p in paths]
+
+
+def _try_decode(path, np, seconds):
+    try:
+        return decode(path, np, seconds)
+    except (RuntimeError, subprocess.TimeoutExpired):
+        return None
+
+
+def trim_clip(path, offset):
+    """Cut `offset` seconds off the front of a clip in place, without re-encoding."""
+    tmp = path.with_name(f".trim-{path.name}")
+    proc = subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-ss", str(offset), "-i", str(path),
+         "-c", "copy", "-map_metadata", "-1", str(tmp)],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tmp.unlink(missing_ok=True)
+        raise RuntimeError(proc.stderr.strip()[:200])
+    tmp.replace(path)
+
+
+# --- Main --------------------------------------------------------------------
+
+
+def run_pass(todo, state, args, seconds, windows):
+    """Analyse `todo` [(path, digest)] in the process pool. Returns failed ids."""
+    failed = []
+    batches = [todo[b : b + args.batch] for b in range(0, len(todo), args.batch)]
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            pool.submit(analyse_files, [p for p, _ in batch], seconds, windows): dict(batch)
+            for batch in batches
+        }
+        for fut in as_completed(futures):
+            digests = futures[fut]
+            for path, result in fut.result():
+                if result is None:
+                    failed.append(path.stem)
+                    continue
+                sidecar, details = result
+                (META_DIR / f"{path.stem}.json").write_text(
+                    json.dumps(sidecar, separators=(",", ":")) + "\n", encoding="utf-8"
+                )
+                state[path.stem] = {"sha256": digests[path], **details, "start": sidecar["start"]}
+                note = f"  starts at {sidecar['start']}s" if sidecar["start"] else ""
+                print(f"  ✅ {path.stem}  {sidecar['lufs']} LUFS  gain {sidecar['gain_db']:+.1f} dB{note}")
+    return failed
+
+
+def report(clips, state, windows):
+    """Print clips whose first unlock windows are mostly silent, and long gaps."""
+    flagged = []
+    for path in clips:
+        entry = state.get(path.stem)
+        if not isinstance(entry, dict):
+            continue
+        bad = [
+            f"first {t}s {round(frac * 100)}% silent"
+            for t, frac in zip(windows, entry.get("windows", []))
+            if frac >= MOSTLY_SILENT
+        ]
+        gaps = [f"{a}-{b}s" for a, b in entry.get("stretches", [])]
+        if bad or gaps:
+            flagged.append((path.stem, entry, bad, gaps))
+
+    if not flagged:
+        print("\n✅ No clip opens with a mostly silent unlock window.")
+        return
+    print(f"\n🔇 {len(flagged)} clips with silence worth a look:")
+    for stem, entry, bad, gaps in flagged:
+        print(f"  {stem}: " + "; ".join(bad + ([f"near-silent {', '.join(gaps)}"] if gaps else [])))
+        if entry.get("start"):
+            print(f"      recommended start {entry['start']}s (played automatically; --recut to trim)")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools analyze",
+        description="Precompute waveform peaks, loudness and leading silence for every clip.",
+    )
+    ap.add_argument("--force", action="store_true", help="re-analyse unchanged clips")
+    ap.add_argument("--recut", action="store_true",
+                    help="trim each clip's leading silence off the file itself (clips "
+                    "with a cached source are better re-cut by `python -m tools recut`, "
+                    "which keeps their full length)")
+    ap.add_argument("--batch", type=int, default=4, help="clips per NumPy batch")
+    ap.add_argument("--jobs", type=int, default=4, help="worker processes")
+    args = ap.parse_args(argv)
+
+    check_dependencies()
+    clips = list_clips()
+    if not clips:
+        print(f"❌ No clips in {AUDIO_DIR}. Run tools/download_audio.py first.")
+        return 1
+
+    state = load_state("analysis")
+    loaded = dict(state)
+    META_DIR.mkdir(parents=True, exist_ok=True)
+
+    def todo_for(paths, force):
+        todo = []
+        for path in paths:
+            digest = sha256(path)
+            entry = state.get(path.stem)
+            known = isinstance(entry, dict) and entry.get("sha256") == digest
+            if force or not known or not (META_DIR / f"{path.stem}.json").exists():
+                todo.append((path, digest))
+        return todo
+
+    todo = todo_for(clips, args.force)
+    print(f"🎚️  {len(clips)} clips, {len(todo)} new or changed")
+    settings_times = load_settings()["times"]
+    seconds, windows = max(settings_times), tuple(settings_times[:REPORT_WINDOWS])
+    started = time.perf_counter()
+    failed = run_pass(todo, state, args, seconds, windows)
+
+    if args.recut:
+        trimmed = []
+        for path in clips:
+            entry = state.get(path.stem)
+            if isinstance(entry, dict) and entry.get("start"):
+                try:
+                    trim_clip(path, entry["start"])
+                    trimmed.append(path)
+                    print(f"  ✂️  {path.stem}: trimmed {entry['start']}s of leading silence")
+                except RuntimeError as e:
+                    print(f"  ❌ {path.stem}: trim failed: {e}")
+        if trimmed:
+            # Keep the source offset recut compares against in step.
+            with update_state("clips") as manifest:
+                for path in trimmed:
+                    if path.stem in manifest:
+                        made = manifest[path.stem]
+                        made["start"] = round(made.get("start", 0.0) + state[path.stem]["start"], 2)
+        # Re-analyse what was trimmed so sidecars and state describe the new bytes.
+        failed += run_pass(todo_for(trimmed, True), state, args, seconds, windows)
+
+    # Sidecars for clips that no longer exist would otherwise linger forever.
+    live = {p.stem for p in clips}
+    for stale in META_DIR.glob("*.json"):
+        if stale.stem not in live:
+            stale.unlink()
+            state.pop(stale.stem, None)
+
+    # Merge only what this run changed: recut may have updated analysis.json
+    # while the pool was busy.
+    changed = {k: v for k, v in state.items() if loaded.get(k) != v}
+    gone = [k for k in loaded if k not in state]
+    if changed or gone:
+        with update_state("analysis") as saved:
+            saved.update(changed)
+            for k in gone:
+                saved.pop(k, None)
+
+    took = time.perf_counter() - started
+    print(f"\n✅ Analysed {len(todo) - len(failed)} clips in {took:.1f}s -> {META_DIR}")
+    report(clips, state, windows)
+    for stem in failed:
+        print(f"❌ {stem}: could not decode")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Cancelled")
+        sys.exit(130)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Sam Bowman Heardle - Song Data Build
+
+Splits music.json into what the page needs up front and what it needs only
+once the game is over, and precomputes the autocomplete index:
+
+  src/settings/songs.json     bundled with the app. Display titles, albums and
+                              ids in music.json order (the daily rotation
+                              depends on that order), plus the search index.
+  public/songs/<id>.json      {"url", "art"} for one song, fetched lazily when
+                              the game ends to show the reveal and play the
+                              full track.
+
+The search index is a sorted list of normalized tokens (from titles and album
+names) with a posting list of song indices for each, so src/songs.js answers a
+query with a binary search per typed word and never indexes anything at load.
+A posting is the song index when the token is in its title and ~index (-i-1)
+when it is only in the album name, which lets title hits rank first.
+
+Run it after anything that changes music.json. The outputs are committed, so
+the site build does not need Python. songs.json records a hash of the
+music.json it was built from, and `python -m tools validate` warns when the
+two have drifted apart. Each run reports the bundled payload size and parse
+time against importing music.json whole.
+
+USAGE
+
+    python -m tools songs
+    python tools/build_songs.py
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+import sys
+import time
+import unicodedata
+from collections import defaultdict
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/build_songs.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.common import MUSIC_JSON, SONG_DETAILS_DIR, SONGS_JSON, utf8_console
+
+FORMAT_VERSION = 1
+
+# Fields that only matter after the game ends, moved to public/songs/<id>.json.
+DETAIL_FIELDS = ("url", "art")
+
+# Parse-time measurements are averaged over this many parses.
+PARSE_ROUNDS = 200
+
+
+def tokens(text):
+    """
+    Search tokens for `text`. Must stay in step with normalize() in src/songs.js:
+    accents stripped, lowercased, apostrophes dropped ("don't" -> "dont"), "&"
+    read as "and", and everything else that is not a letter or digit a break.
+    """
+    t = re.sub("[\u0300-\u036f]", "", unicodedata.normalize("NFKD", text)).lower()
+    t = re.sub("['\u2019]", "", t).replace("&", " and ")
+    return [w for w in re.split(r"[^a-z0-9]+", t) if w]
+
+
+def source_hash(raw):
+    return hashlib.sha1(raw).hexdigest()[:12]
+
+
+def build(music, raw):
+    """Return (songs payload, {id: details})."""
+    missing = [t.get("title", "?") for t in music if not t.get("id")]
+    if missing:
+        raise ValueError(f"entries without an id: {', '.join(missing)} (run python -m tools validate)")
+
+    albums = list(dict.fromkeys(t.get("album", "") for t in music))
+    album_index = {name: i for i, name in enumerate(albums)}
+
+    postings = defaultdict(list)
+    for i, track in enumerate(music):
+        title = set(tokens(track["title"]))
+        for tok in title:
+            postings[tok].append(i)
+        for tok in set(tokens(track.get("album", ""))) - title:
+            postings[tok].append(~i)
+    index = sorted(postings)
+
+    songs = {
+        "v": FORMAT_VERSION,
+        "source": source_hash(raw),
+        "albums": albums,
+        "songs": [[t["title"], album_index[t.get("album", "")], t["id"]] for t in music],
+        "tokens": index,
+        "postings": [sorted(postings[tok], key=lambda p: p if p >= 0 else ~p) for tok in index],
+    }
+    details = {t["id"]: {k: t[k] for k in DETAIL_FIELDS if t.get(k)} for t in music}
+    return songs, details
+
+
+def _compact(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def write_outputs(songs, details):
+    """Write songs.json and the details files. Returns (written, removed) counts."""
+    SONGS_JSON.write_text(_compact(songs) + "\n", encoding="utf-8")
+
+    SONG_DETAILS_DIR.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for song_id, detail in details.items():
+        path = SONG_DETAILS_DIR / f"{song_id}.json"
+        text = _compact(detail) + "\n"
+        # Leave unchanged files alone so their mtimes (and deploy diffs) stay put.
+        if not path.exists() or path.read_text(encoding="utf-8") != text:
+            path.write_text(text, encoding="utf-8")
+            written += 1
+    removed = 0
+    for stale in SONG_DETAILS_DIR.glob("*.json"):
+        if stale.stem not in details:
+            stale.unlink()
+            removed += 1
+    return written, removed
+
+
+def parse_ms(text):
+    """Average milliseconds to parse `text` as JSON: in node when available,
+    since that is closest to the browser, otherwise in Python."""
+    node = shutil.which("node")
+    if node:
+        script = (
+            "const t=require('fs').readFileSync(0,'utf8');"
+            f"for(let i=0;i<20;i++)JSON.parse(t);const s=process.hrtime.bigint();"
+            f"for(let i=0;i<{PARSE_ROUNDS};i++)JSON.parse(t);"
+            f"console.log(Number(process.hrtime.bigint()-s)/1e6/{PARSE_ROUNDS})"
+        )
+        proc = subprocess.run([node, "-e", script], input=text, capture_output=True, text=True)
+        if proc.returncode == 0:
+            return float(proc.stdout), "node"
+    started = time.perf_counter()
+    for _ in range(PARSE_ROUNDS):
+        json.loads(text)
+    return (time.perf_counter() - started) * 1000 / PARSE_ROUNDS, "python"
+
+
+def report(music, songs):
+    """Print bundled payload size and parse time, music.json versus songs.json."""
+    rows = []
+    for label, data in (("music.json", music), ("songs.json", songs)):
+        text = _compact(data)
+        raw = text.encode("utf-8")
+        ms, engine = parse_ms(text)
+        rows.append((label, len(raw), len(gzip.compress(raw, 9)), ms, engine))
+
+    print(f"\n{'bundled':<12}{'bytes':>9}{'gzip':>9}{'parse':>11}")
+    for label, size, packed, ms, engine in rows:
+        print(f"{label:<12}{size:>9,}{packed:>9,}{ms:>8.3f} ms  ({engine})")
+    (_, before, before_gz, _, _), (_, after, after_gz, _, _) = rows
+    print(f"\n📉 {100 * (1 - after / before):.0f}% smaller ({100 * (1 - after_gz / before_gz):.0f}% gzipped),"
+          " with the search index included and no fuzzy-search setup at load")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools songs",
+        description="Build the compact frontend song data from music.json.",
+    )
+    ap.add_argument("--no-report", action="store_true", help="skip the size/parse-time report")
+    args = ap.parse_args(argv)
+    utf8_console()
+
+    raw = MUSIC_JSON.read_bytes()
+    music = json.loads(raw)
+    try:
+        songs, details = build(music, raw)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    written, removed = write_outputs(songs, details)
+    print(f"✅ {len(music)} songs, {len(songs['tokens'])} search tokens -> {SONGS_JSON.name}")
+    print(f"   {written} details files written, {removed} removed -> public/songs/")
+    if not args.no_report:
+        report(music, songs)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
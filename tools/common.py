@@ -0,0 +1,321 @@
+"""
+Shared configuration and pure helpers for the tools.
+
+Everything here is standard library only and free of import-time side effects,
+so `from tools.common import slugify` stays fast enough to use anywhere.
+"""
+
+import contextlib
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# --- Configuration -----------------------------------------------------------
+#
+# All three IDs are for this project's artist. Point them somewhere else to reuse
+# the tools for a different Heardle.
+
+ARTIST_NAME = "Sam Bowman"
+DEEZER_ARTIST_ID = 11145178
+YOUTUBE_CHANNEL = "https://www.youtube.com/channel/UC4-DeiRFx7RPhooKaFAYXdA"
+
+TOOLS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = TOOLS_DIR.parent
+MUSIC_JSON = PROJECT_ROOT / "src" / "settings" / "music.json"
+SETTINGS_JSON = PROJECT_ROOT / "src" / "settings" / "settings.json"
+AUDIO_DIR = PROJECT_ROOT / "public" / "audio"
+META_DIR = PROJECT_ROOT / "public" / "audio-meta"
+
+# The frontend never imports music.json directly: tools/build_songs.py splits
+# it into a compact search payload bundled with the app and one small details
+# file per song, fetched when the game ends.
+SONGS_JSON = PROJECT_ROOT / "src" / "settings" / "songs.json"
+SONG_DETAILS_DIR = PROJECT_ROOT / "public" / "songs"
+
+# A clip is public/audio/<id>.mp3, or <id>.m4a when an AAC source was
+# stream-copied instead of re-encoded. api/audio.js looks for them in this order.
+CLIP_EXTS = (".mp3", ".m4a")
+
+# Local state the tools keep between runs (hash tables, caches). Never deployed:
+# .vercelignore drops the whole tools/ folder.
+CACHE_DIR = TOOLS_DIR / ".cache"
+
+
+# --- music.json / settings.json ----------------------------------------------
+
+
+def load_music():
+    return json.loads(MUSIC_JSON.read_text(encoding="utf-8"))
+
+
+def save_music(music):
+    MUSIC_JSON.write_text(
+        json.dumps(music, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    )
+
+
+def load_settings():
+    return json.loads(SETTINGS_JSON.read_text(encoding="utf-8"))
+
+
+def find_clip(clip_id, audio_dir=AUDIO_DIR):
+    """Path of the clip for this id, whichever format it is in, or None."""
+    for ext in CLIP_EXTS:
+        path = audio_dir / f"{clip_id}{ext}"
+        if path.exists():
+            return path
+    return None
+
+
+def list_clips(audio_dir=AUDIO_DIR):
+    """Every clip in audio_dir, one per id, sorted by id."""
+    clips = {}
+    for ext in reversed(CLIP_EXTS):  # earlier extensions win, as in find_clip
+        for path in audio_dir.glob(f"*{ext}"):
+            clips[path.stem] = path
+    return [clips[k] for k in sorted(clips)]
+
+
+def load_state(name, default=None):
+    """Read tools/.cache/<name>.json, or `default` if it does not exist yet."""
+    path = CACHE_DIR / f"{name}.json"
+    if not path.exists():
+        return {} if default is None else default
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_state(name, data):
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = CACHE_DIR / f"{name}.json"
+    # A temp file of its own, so concurrent writers never write into each
+    # other's file or rename it out from under one another.
+    fd, tmp = tempfile.mkstemp(prefix=f".{name}-", suffix=".tmp", dir=CACHE_DIR)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, indent=2, sort_keys=True) + "\n")
+        os.replace(tmp, path)  # atomic: a crash never leaves half a file behind
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+def _lock_fd(fd, wait):
+    """Take an exclusive OS lock on fd; raises OSError if busy and not wait."""
+    if sys.platform == "win32":
+        import msvcrt
+
+        while True:
+            try:
+                msvcrt.locking(fd, msvcrt.LK_LOCK if wait else msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                if not wait:  # LK_LOCK gives up after ten seconds; keep waiting
+                    raise
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_EX | (0 if wait else fcntl.LOCK_NB))
+
+
+@contextlib.contextmanager
+def update_state(name, default=None):
+    """
+    Read-modify-write tools/.cache/<name>.json under a lock, for state that
+    several processes update at once (e.g. queue workers):
+
+        with update_state("clips") as clips:
+            clips[clip_id] = made
+
+    Waits for the lock rather than failing, and keeps the hold short: do the
+    slow work first and only merge its results in here. Nothing is saved if
+    the block raises.
+    """
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd = os.open(CACHE_DIR / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        _lock_fd(fd, wait=True)
+        data = load_state(name, default)
+        yield data
+        save_state(name, data)
+    finally:
+        os.close(fd)  # closing the descriptor releases the lock
+
+
+class MusicLocked(RuntimeError):
+    """Another process is in the middle of a music.json write cycle."""
+
+
+_music_fd = None
+_lock_depth = 0
+
+
+@contextlib.contextmanager
+def music_lock():
+    """
+    Hold the music.json write lock for a whole read-modify-write cycle.
+
+    It is an OS-level lock on tools/.cache/music.lock, so the kernel releases it
+    if the holder dies; there is never a stale lock to clean up by hand. It is
+    re-entrant within a process, because the daemon holds it across a cycle
+    that calls the same sync/repair code a manual run would. A second process
+    gets MusicLocked immediately rather than queueing behind a long sync.
+    """
+    global _music_fd, _lock_depth
+    if _lock_depth == 0:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        fd = os.open(CACHE_DIR / "music.lock", os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            _lock_fd(fd, wait=False)
+        except OSError:
+            holder = os.read(fd, 32).decode("ascii", "replace").strip() or "?"
+            os.close(fd)
+            raise MusicLocked(
+                f"music.json is being written by another process (pid {holder}); try again shortly"
+            ) from None
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode("ascii"))
+        _music_fd = fd
+    _lock_depth += 1
+    try:
+        yield
+    finally:
+        _lock_depth -= 1
+        if _lock_depth == 0:
+            os.close(_music_fd)  # closing the descriptor releases the lock
+            _music_fd = None
+
+
+def utf8_console():
+    """Force UTF-8 console output on Windows, where the emoji would crash print."""
+    if sys.platform == "win32" and sys.stdout.encoding.lower() != "utf-8":
+        import io
+
+        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8")
+        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8")
+
+
+# --- Title helpers -----------------------------------------------------------
+
+
+def match_key(title):
+    """
+    Aggressively normalize a track title so Deezer and YouTube spellings collide.
+
+    Deezer and YouTube disagree constantly on case, punctuation, and suffixes
+    like "(from Young Pop Renegades, Vol. 2)", so all of that is stripped. This
+    key is ONLY for matching -- never write it back to music.json.
+    """
+    t = title.lower()
+    t = re.sub(r"\(from [^)]*\)", " ", t)
+    t = re.sub(r"\[(official|lyric)[^\]]*\]", " ", t)
+    t = re.sub(r"\((official|lyric|audio|visualizer)[^)]*\)", " ", t)
+    # Drop guest credits entirely, names included. music.json often stores a
+    # bare "Spark" where YouTube has "Spark (feat. Rapture Ruckus)"; keeping the
+    # guest's name would make those two titles never agree.
+    t = re.sub(r"[\(\[]\s*(feat|ft)\.?[^)\]]*[\)\]]", " ", t)
+    t = t.replace("&", " and ")
+    t = re.sub(r"\bfeat\.?\b|\bft\.?\b", " ", t)
+    t = re.sub(r"[^a-z0-9]+", "", t)
+    return t
+
+
+def slugify(title):
+    """
+    Port of scripts/update-music-ids.js.
+
+    MUST stay byte-identical to that implementation: the id becomes the audio
+    filename (public/audio/<id>.mp3), so any drift silently breaks playback.
+    JavaScript's \\w is ASCII-only, hence re.ASCII here.
+    """
+    s = title.lower().strip()
+    s = re.sub(r"[^\w\s-]", "", s, flags=re.ASCII)
+    s = re.sub(r"\s+", "-", s)
+    s = re.sub(r"-+", "-", s)
+    return s
+
+
+def title_keys(video_title):
+    """
+    Every plausible normalized key for a YouTube title.
+
+    Collabs are usually uploaded to the *collaborator's* channel and titled
+    "Matthew Parker & Sam Bowman - Gravity Strikes Again (Official Lyric Video)".
+    Matching the whole string against "Gravity Strikes Again" fails, so we also
+    offer the text after each artist separator as a candidate key.
+    """
+    keys = {match_key(video_title)}
+    for sep in (" - ", " | ", " – ", " — ", ": "):
+        if sep in video_title:
+            head, _, tail = video_title.partition(sep)
+            keys.add(match_key(tail))
+            keys.add(match_key(video_title.rsplit(sep, 1)[-1]))
+    keys.discard("")
+    return keys
+
+
+# --- Daily rotation ----------------------------------------------------------
+
+
+def _js_random(seed):
+    # Same expression as random() in src/game.js. math.sin and V8's Math.sin
+    # agree to the last bit on integer seeds in practice, and the result is
+    # floored into an index anyway.
+    x = math.sin(seed) * 10000
+    return x - math.floor(x)
+
+
+def rotation(music, settings):
+    """
+    Port of the seeded shuffle in src/game.js: music in the order it is played.
+
+    Entry i of the result is the song on every day d with d % len(music) == i.
+    """
+    from datetime import datetime
+
+    order = list(music)
+    start = settings.get("start-date")
+    ms = datetime.fromisoformat(start.replace("Z", "+00:00")).timestamp() * 1000 if start else 0
+    seed = math.floor(ms / 86400000)
+    m = len(order)
+    while m:
+        i = math.floor(_js_random(seed) * m)
+        m -= 1
+        order[m], order[i] = order[i], order[m]
+        seed += 1
+    return order
+
+
+def day_index(settings, now=None):
+    """Port of daysSinceStartInCT() in src/game.js: today's puzzle number."""
+    from datetime import datetime, timedelta, timezone
+
+    try:
+        from zoneinfo import ZoneInfo
+
+        ct = ZoneInfo("America/Chicago")
+    except Exception:  # no tz database (bare Windows): CST is close enough
+        ct = timezone(timedelta(hours=-6))
+    start = settings.get("start-date")
+    start = datetime.fromisoformat(start.replace("Z", "+00:00")) if start else datetime.fromtimestamp(0, timezone.utc)
+    now = now or datetime.now(timezone.utc)
+    return (now.astimezone(ct).date() - start.astimezone(ct).date()).days
+
+
+def days_until_play(music, settings, now=None):
+    """
+    {id: days until that song is next the daily puzzle}; 0 means today.
+
+    Empty in infinite mode, where songs are picked at random.
+    """
+    if settings.get("infinite") or not music:
+        return {}
+    today = day_index(settings, now) % len(music)
+    return {
+        t.get("id"): (pos - today) % len(music)
+        for pos, t in enumerate(rotation(music, settings))
+    }
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Sam Bowman Heardle - Maintenance Daemon
+
+Keeps the catalog healthy without anyone remembering to run sync, verify,
+repair and download in the right order. Every --interval minutes it runs one
+cycle:
+
+  1. Incremental sync. Only Deezer releases since the last successful sync
+     (minus a safety overlap, because Deezer back-dates some releases) are
+     fetched, and confident matches are added to music.json.
+  2. Rolling verification. Instead of hitting YouTube with every URL at once,
+     each cycle checks a slice just big enough that the whole catalog is
+     covered once per --verify-days. Songs due for re-checking are taken in
+     order of their next play date, so tomorrow's song is never the one whose
+     dead link goes unnoticed.
+  3. Repair. Dead URLs found by the slice are re-matched with the same rules
+     as `sync --repair`, and confident replacements are written.
+  4. Download. Any entry without a clip in public/audio/ gets one.
+
+When a cycle changes music.json, the frontend song data is rebuilt with it
+(tools/build_songs.py), so the site never lags the catalog.
+
+Steps 1-3 run under the music.json write lock (tools/common.py), so a cycle
+never overlaps a manual `sync --apply` or a second daemon; if the lock is busy
+the cycle is skipped and retried shortly after.
+
+State (last sync date, per-song last verification, next cycle time) is kept in
+tools/.cache/daemon.json and survives restarts: a restarted daemon waits for
+the cycle it had scheduled instead of starting a fresh one immediately. Status
+and running totals go to tools/.cache/daemon-status.json after every step, and
+optionally over HTTP with --status-port.
+
+USAGE
+
+    python -m tools daemon                       # run forever, every 6 hours
+    python -m tools daemon --once                # one cycle, then exit
+    python -m tools daemon --status-port 8765    # also serve status as JSON
+"""
+
+import argparse
+import json
+import math
+import os
+import signal
+import sys
+import threading
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/daemon.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.common import (
+    AUDIO_DIR,
+    CACHE_DIR,
+    MusicLocked,
+    days_until_play,
+    find_clip,
+    load_music,
+    load_settings,
+    load_state,
+    music_lock,
+    save_state,
+    utf8_console,
+)
+
+# Deezer sometimes lists a release under an earlier date than the day it
+# actually appeared, so each incremental sync looks back this far.
+SINCE_OVERLAP_DAYS = 30
+
+# When a cycle is skipped because music.json is busy, retry after this long
+# rather than waiting a whole interval.
+LOCKED_RETRY_MINUTES = 10
+
+STATUS_JSON = CACHE_DIR / "daemon-status.json"
+
+_stop = threading.Event()
+_status = {}
+# The status as last published, already serialized: the HTTP thread serves
+# this snapshot and never touches _status, which the cycle keeps mutating.
+_status_lock = threading.Lock()
+_status_body = b"{}\n"
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _iso(dt):
+    return dt.replace(microsecond=0).isoformat()
+
+
+def publish(**fields):
+    """Merge fields into the status and write it out atomically."""
+    global _status_body
+    with _status_lock:
+        _status.update(fields, updated=_iso(_now()))
+        text = json.dumps(_status, indent=2) + "\n"
+        _status_body = text.encode("utf-8")
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = STATUS_JSON.with_suffix(".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    tmp.replace(STATUS_JSON)
+
+
+def serve_status(port):
+    """Serve the current status as JSON on http://127.0.0.1:<port>/."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with _status_lock:
+                body = _status_body
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # keep the cycle log readable
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"📡 Status at http://127.0.0.1:{port}/")
+
+
+# --- Cycle steps -------------------------------------------------------------
+
+
+def verify_slice(music, state, interval_hours, verify_days):
+    """
+    The entries to verify this cycle.
+
+    Sized so that, at one cycle per interval, every entry is checked once per
+    verify_days. Only entries not verified within that period are eligible;
+    among them, the soonest to be played come first.
+    """
+    per_cycle = max(1, math.ceil(len(music) * interval_hours / (verify_days * 24)))
+    cutoff = _iso(_now() - timedelta(days=verify_days))
+    verified = state.setdefault("verified", {})
+    upcoming = days_until_play(music, load_settings())
+
+    due = [t for t in music if t.get("id") and verified.get(t["id"], "") < cutoff]
+    due.sort(key=lambda t: (upcoming.get(t["id"], 0), verified.get(t["id"], "")))
+    return due[:per_cycle]
+
+
+def run_cycle(state, args):
+    """One sync/verify/repair/download pass. Returns a summary dict."""
+    from tools import build_songs, download_audio, sync_music
+
+    summary = {"started": _iso(_now()), "added": [], "verified": 0, "unchecked": 0, "dead": [], "repaired": []}
+
+    with music_lock():
+        music = load_music()
+
+        since = None
+        if state.get("last_sync"):
+            since = (date.fromisoformat(state["last_sync"]) - timedelta(days=SINCE_OVERLAP_DAYS)).isoformat()
+        publish(phase="sync", since=since)
+        added = sync_music.cmd_sync(
+            music, since=since, apply=True, search_fallback=not args.no_search_fallback
+        )
+        state["last_sync"] = date.today().isoformat()
+        summary["added"] = [t["id"] for t in added]
+        save_state("daemon", state)
+
+        batch = verify_slice(music, state, args.interval / 60, args.verify_days)
+        publish(phase="verify", verifying=len(batch))
+        print(f"\n🔍 Verifying {len(batch)} of {len(music)} URLs this cycle")
+        dead, unchecked = [], 0
+        for track in batch:
+            alive = sync_music.url_alive(track["url"]) if track.get("url") else False
+            if alive is None:
+                # Offline or throttled: says nothing about the video. Leave it
+                # unverified so the next cycle checks it again.
+                print(f"  ⚠️  {track['title']} (could not check)")
+                unchecked += 1
+                continue
+            state["verified"][track["id"]] = _iso(_now())
+            print(f"  {'✅' if alive else '❌'} {track['title']}")
+            if not alive:
+                dead.append(track)
+        summary["verified"] = len(batch) - unchecked
+        summary["unchecked"] = unchecked
+        summary["dead"] = [t["id"] for t in dead]
+        save_state("daemon", state)
+
+        if dead and not args.no_repair:
+            publish(phase="repair")
+            fixed, _ = sync_music.repair_dead(music, dead, apply=True)
+            summary["repaired"] = [t["id"] for t, _ in fixed]
+
+        if summary["added"] or summary["repaired"]:
+            build_songs.main(["--no-report"])
+
+    # Clips are files of their own; no need to hold the music.json lock here.
+    missing = [
+        t for t in music
+        if t.get("id") and t.get("url") and not find_clip(t["id"])
+    ]
+    publish(phase="download", downloading=len(missing))
+    summary["downloaded"], summary["download_failed"] = [], []
+    if missing:
+        AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+        print(f"\n🔽 Downloading {len(missing)} missing clips")
+        for track in missing:
+            print(f"\n{track['title']}")
+            ok = download_audio.download_audio(
+                track["url"], track["id"], AUDIO_DIR, track.get("sources", ())
+            )
+            if ok:
+                download_audio.record_clips({track["id"]: ok})
+            summary["downloaded" if ok else "download_failed"].append(track["id"])
+
+    summary["finished"] = _iso(_now())
+    return summary
+
+
+# --- Main loop ---------------------------------------------------------------
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools daemon",
+        description="Keep music.json and public/audio/ healthy on a schedule.",
+    )
+    ap.add_argument("--interval", type=float, default=360, metavar="MIN",
+                    help="minutes between cycles (default 360)")
+    ap.add_argument("--verify-days", type=float, default=7, metavar="DAYS",
+                    help="verify every URL once per this many days (default 7)")
+    ap.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    ap.add_argument("--status-port", type=int, metavar="PORT",
+                    help="also serve status JSON on 127.0.0.1:PORT")
+    ap.add_argument("--no-repair", action="store_true",
+                    help="report dead URLs but do not write replacements")
+    ap.add_argument("--no-search-fallback", action="store_true",
+                    help="channel listing only when syncing")
+    args = ap.parse_args(argv)
+    utf8_console()
+
+    signal.signal(signal.SIGTERM, lambda *_: _stop.set())
+    state = load_state("daemon")
+    totals = state.setdefault("totals", {"cycles": 0, "added": 0, "verified": 0, "dead": 0, "repaired": 0, "downloaded": 0})
+    publish(pid=os.getpid(), phase="idle", totals=totals,
+            last_cycle=state.get("last_cycle"), next_cycle=state.get("next_cycle"))
+    if args.status_port:
+        serve_status(args.status_port)
+
+    while not _stop.is_set():
+        due = state.get("next_cycle")
+        if due and not args.once:
+            wait = (datetime.fromisoformat(due) - _now()).total_seconds()
+            if wait > 0:
+                publish(phase="sleeping", next_cycle=due)
+                print(f"💤 Next cycle at {due}")
+                if _stop.wait(wait):
+                    break
+
+        print(f"\n{'=' * 72}\n🛠️  Maintenance cycle starting {_iso(_now())}\n{'=' * 72}")
+        publish(phase="starting")
+        delay = args.interval
+        try:
+            summary = run_cycle(state, args)
+        except MusicLocked as e:
+            print(f"⏭️  {e}")
+            summary = {"skipped": str(e)}
+            delay = min(args.interval, LOCKED_RETRY_MINUTES)
+        except Exception as e:  # keep the daemon alive; the next cycle retries
+            print(f"❌ Cycle failed: {e}")
+            summary = {"error": str(e)}
+
+        if "finished" in summary:
+            totals["cycles"] += 1
+            for key in ("added", "verified", "dead", "repaired", "downloaded"):
+                value = summary.get(key, 0)
+                totals[key] += value if isinstance(value, int) else len(value)
+        state["last_cycle"] = summary
+        state["next_cycle"] = _iso(_now() + timedelta(minutes=delay))
+        save_state("daemon", state)
+        publish(phase="idle", last_cycle=summary, totals=totals, next_cycle=state["next_cycle"])
+
+        if args.once:
+            break
+
+    publish(phase="stopped")
+    return 1 if "error" in state.get("last_cycle", {}) else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        publish(phase="stopped")
+        print("\n\n⚠️  Stopped")
+        sys.exit(130)
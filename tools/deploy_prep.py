@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Sam Bowman Heardle - Prepare a Deploy of the Audio Clips
+
+Hashes every clip in public/audio/ and compares the result with the snapshot
+of the last deploy (tools/.cache/deployed.json), printing exactly which clips
+were added, changed or removed since. Clips whose id is no longer in
+music.json are flagged as orphans: they would ship, but nothing plays them.
+
+Clips are hashed in a thread pool over memory-mapped reads; hashlib releases
+the GIL on large buffers, so a few hundred clips take well under a second.
+
+Two optional outputs let an uploader ship only the changed bytes:
+
+  --layout DIR       a content-addressed copy of the clips: each clip as
+                     <sha256 prefix><ext>, plus index.json mapping id -> file.
+                     A file name never changes content, so syncing DIR to a
+                     bucket or CDN uploads only new names, and they can be
+                     served with immutable caching. Hash-named files no
+                     longer in the index are removed, so DIR must be new,
+                     empty, or an earlier layout, and apart from public/audio.
+  --ignore-list FILE unchanged clips and orphans, one path per line, for
+                     rsync --exclude-from and similar incremental uploaders.
+                     Not for .vercelignore: a Vercel deploy replaces the
+                     whole site, so an ignored clip would go missing.
+
+After a successful deploy, run with --mark-deployed to make the current clips
+the new snapshot.
+
+USAGE
+
+    python -m tools deploy                    # show what changed since last deploy
+    python -m tools deploy --layout dist-audio
+    python -m tools deploy --mark-deployed    # after vercel --prod succeeded
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/deploy_prep.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.common import AUDIO_DIR, PROJECT_ROOT, load_music, load_state, save_state, utf8_console
+
+# Hex digits of the sha256 used in content-addressed names: collisions are
+# not a concern at catalog sizes, and the names stay short.
+HASH_PREFIX = 16
+
+# The only files write_layout ever removes: hash-named clips it wrote itself.
+LAYOUT_NAME = re.compile(rf"[0-9a-f]{{{HASH_PREFIX}}}\.(mp3|m4a)")
+
+
+def file_hash(path):
+    """sha256 hex digest of a file, read through mmap."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size:  # an empty file cannot be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                digest.update(m)
+    return digest.hexdigest()
+
+
+def hash_clips(audio_dir=AUDIO_DIR, jobs=None):
+    """{file name: sha256} for every file in audio_dir, hashed in parallel."""
+    paths = sorted(p for p in audio_dir.iterdir() if p.is_file() and not p.name.startswith("."))
+    with ThreadPoolExecutor(max_workers=jobs or min(32, (os.cpu_count() or 2) * 2)) as pool:
+        return dict(zip((p.name for p in paths), pool.map(file_hash, paths)))
+
+
+def diff(previous, current):
+    """(added, changed, removed) file names between two {name: sha256} snapshots."""
+    added = sorted(set(current) - set(previous))
+    removed = sorted(set(previous) - set(current))
+    changed = sorted(n for n in set(current) & set(previous) if current[n] != previous[n])
+    return added, changed, removed
+
+
+def layout_problem(layout_dir, audio_dir=AUDIO_DIR):
+    """Why layout_dir must not be used for --layout, or None if it is safe.
+
+    write_layout prunes what is no longer indexed, so it only works in a folder
+    it made itself: a new or empty one, or one holding an earlier index.json.
+    """
+    target, audio = layout_dir.resolve(), audio_dir.resolve()
+    if target == audio or target in audio.parents or audio in target.parents:
+        return f"{layout_dir} overlaps {audio_dir}; pick a separate folder"
+    if target.exists() and not target.is_dir():
+        return f"{layout_dir} is not a folder"
+    if target.is_dir() and any(target.iterdir()) and not (target / "index.json").exists():
+        return f"{layout_dir} is not empty and has no index.json from an earlier --layout run"
+    return None
+
+
+def write_layout(layout_dir, hashes, orphans, audio_dir=AUDIO_DIR):
+    """
+    Write the content-addressed copy of the clips to layout_dir. Returns
+    (files written, files removed); names already present are left alone.
+    Check layout_problem() first.
+    """
+    layout_dir.mkdir(parents=True, exist_ok=True)
+    index, written = {}, 0
+    for name, digest in sorted(hashes.items()):
+        stem, ext = os.path.splitext(name)
+        if stem in orphans:
+            continue
+        target = f"{digest[:HASH_PREFIX]}{ext}"
+        index[stem] = target
+        if not (layout_dir / target).exists():
+            try:
+                os.link(audio_dir / name, layout_dir / target)
+            except OSError:  # another filesystem, or no hard links
+                shutil.copy2(audio_dir / name, layout_dir / target)
+            written += 1
+
+    keep = set(index.values()) | {"index.json"}
+    removed = 0
+    for path in layout_dir.iterdir():
+        if path.is_file() and path.name not in keep and LAYOUT_NAME.fullmatch(path.name):
+            path.unlink()
+            removed += 1
+    (layout_dir / "index.json").write_text(json.dumps(index, indent=2) + "\n", encoding="utf-8")
+    return written, removed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools deploy",
+        description="Show which clips changed since the last deploy.",
+    )
+    ap.add_argument("--layout", metavar="DIR", type=Path, help="write a content-addressed copy of the clips to DIR")
+    ap.add_argument("--ignore-list", metavar="FILE", type=Path, help="write unchanged clips and orphans to FILE")
+    ap.add_argument("--mark-deployed", action="store_true", help="save the current clips as the deployed snapshot")
+    ap.add_argument("--jobs", type=int, default=None, help="hashing threads")
+    args = ap.parse_args(argv)
+    utf8_console()
+
+    if not AUDIO_DIR.is_dir():
+        print(f"❌ {AUDIO_DIR} does not exist; run python tools/download_audio.py first")
+        return 1
+
+    if args.layout and layout_problem(args.layout):
+        print(f"❌ --layout: {layout_problem(args.layout)}")
+        return 1
+
+    started = time.perf_counter()
+    hashes = hash_clips(AUDIO_DIR, args.jobs)
+    elapsed = time.perf_counter() - started
+    size = sum((AUDIO_DIR / n).stat().st_size for n in hashes)
+    print(f"🔑 Hashed {len(hashes)} files ({size / 1024 / 1024:.1f} MB) in {elapsed:.2f}s")
+
+    snapshot = load_state("deployed")
+    previous = snapshot.get("files", {})
+    added, changed, removed = diff(previous, hashes)
+    if snapshot:
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(snapshot["at"]))
+        print(f"   Compared with the deploy of {when}\n")
+    else:
+        print("   No deploy recorded yet: everything counts as added\n")
+
+    for label, names in (("➕ Added", added), ("✏️  Changed", changed), ("➖ Removed", removed)):
+        print(f"{label}: {len(names)}")
+        for name in names:
+            print(f"   {name}")
+    unchanged = len(hashes) - len(added) - len(changed)
+    print(f"   ({unchanged} unchanged)")
+
+    ids = {track.get("id") for track in load_music()}
+    orphans = {os.path.splitext(n)[0] for n in hashes} - ids
+    if orphans:
+        print(f"\n⚠️  {len(orphans)} clips have no entry in music.json and would ship unused:")
+        for stem in sorted(orphans):
+            print(f"   {stem}")
+        print("   Delete them from public/audio/ unless the entry is coming back.")
+
+    if args.layout:
+        written, pruned = write_layout(args.layout, hashes, orphans)
+        print(f"\n📦 {args.layout}: {written} new files, {pruned} removed, index.json updated")
+
+    if args.ignore_list:
+        audio = AUDIO_DIR.relative_to(PROJECT_ROOT).as_posix()
+        skip = sorted(
+            n for n in hashes
+            if previous.get(n) == hashes[n] or os.path.splitext(n)[0] in orphans
+        )
+        args.ignore_list.write_text("".join(f"{audio}/{n}\n" for n in skip), encoding="utf-8")
+        print(f"\n📝 {args.ignore_list}: {len(skip)} paths to skip")
+
+    if args.mark_deployed:
+        save_state("deployed", {"at": time.time(), "files": hashes})
+        print("\n✅ Saved as the deployed snapshot")
+    elif added or changed or removed:
+        print("\nAfter deploying, run: python -m tools deploy --mark-deployed")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Cancelled")
+        sys.exit(130)
@@ -25,11 +25,16 @@ The authors assume NO LIABILITY for misuse of this tool.
 
 Downloads audio from YouTube/SoundCloud videos listed in music.json.
 Uses yt-dlp to extract audio, convert to MP3, and save to public/audio/.
+Full-length sources are kept in a size-capped local cache
+(tools/source_cache.py), so `python -m tools recut` can cut new clips when the
+unlock schedule or bitrate changes without downloading anything again.
 
 Key Features:
     - Validates all music.json entries before downloading
     - Skips existing files to avoid re-downloading
-    - Trims audio to first 32 seconds to reduce file size
+    - Trims audio to the longest unlock time in settings.json (32 seconds)
+    - Stream-copies AAC/MP3 sources instead of re-encoding them
+    - Hedges slow downloads across an entry's alternate "sources"
     - Provides detailed error reporting with fix suggestions
     - Only confirms deployment readiness when ALL songs succeed
 
@@ -40,14 +45,25 @@ Requirements:
       (Must be in system PATH for audio conversion)
 
 Usage:
-    python download_audio.py
+    python -m tools download
+    python tools/download_audio.py
 
 Workflow:
     1. Validates music.json entries (checks for 'id' and 'url' fields)
     2. Creates public/audio/ directory if needed
-    3. Downloads audio for each track using yt-dlp
-    4. Converts to MP3 format (128 kbps, first 32 seconds)
-    5. Reports success/failure stats and next steps
+    3. Downloads audio for each track using yt-dlp, unless its source is
+       already in the cache. If the fastest-ranked
+       source has sent no data within --hedge-after seconds, the next of the
+       entry's "sources" starts alongside it; the first to finish is kept
+    4. Cuts the clip: stream copy for AAC (.m4a) or MP3 sources, otherwise
+       re-encodes to MP3 (128 kbps). The parameters used are recorded in
+       tools/.cache/clips.json for recut
+    5. Reports success/failure stats, stream-copy count and CPU saved
+
+Offline / reproducible runs:
+    HEARDLE_TRANSPORT=record:<zip> captures every download into a fixture
+    archive; HEARDLE_TRANSPORT=replay:<zip> replays it with no network, yt-dlp
+    or ffmpeg. See tools/transport.py.
 
 Troubleshooting:
     - If ffmpeg errors occur, ensure ffmpeg is installed and in PATH
@@ -55,20 +71,32 @@ Troubleshooting:
     - Run script again to retry only failed downloads (existing files are skipped)
 """
 
+import argparse
 import json
 import os
+import queue
+import subprocess
 import sys
+import tempfile
+import threading
+import time
 from pathlib import Path
+from urllib.parse import urlparse
 
-# Force UTF-8 encoding for Windows console
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+if __package__ in (None, ""):
+    # Run as a script (python tools/download_audio.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-# Calculate paths relative to script location (now in tools/ folder)
-SCRIPT_DIR = Path(__file__).parent
-PROJECT_ROOT = SCRIPT_DIR.parent
+from tools import source_cache, transport
+from tools.common import (
+    AUDIO_DIR,
+    MUSIC_JSON,
+    find_clip,
+    load_settings,
+    load_state,
+    update_state,
+    utf8_console,
+)
 
 
 def check_dependencies():
@@ -84,10 +112,16 @@ def check_dependencies():
     
     Prints status messages for each dependency check.
     """
-    try:
-        import yt_dlp  # noqa: F401
+    import importlib.util
+    import shutil
+
+    # find_spec locates yt-dlp without importing it; the real (slow) import
+    # happens once, in transport.ytdl_fetch, when the first clip is fetched.
+    if transport.replaying():
+        print(f"✅ Replaying downloads from {transport.ARCHIVE} (yt-dlp not needed)")
+    elif importlib.util.find_spec('yt_dlp') is not None:
         print("✅ yt-dlp is installed")
-    except ImportError:
+    else:
         print("❌ yt-dlp is not installed")
         print("\nInstall it with:")
         print("  pip install yt-dlp")
@@ -95,7 +129,6 @@ def check_dependencies():
     
     # Check for ffmpeg (optional but recommended)
     try:
-        import shutil
         if shutil.which('ffmpeg') or shutil.which('ffmpeg.exe'):
             print("✅ ffmpeg is available (recommended)")
         else:
@@ -127,7 +160,7 @@ def load_music_json(filepath=None):
         - title (str): Song title (optional but recommended)
     """
     if filepath is None:
-        filepath = PROJECT_ROOT / "src" / "settings" / "music.json"
+        filepath = MUSIC_JSON
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             music = json.load(f)
@@ -154,79 +187,351 @@ def ensure_audio_directory():
         This directory will contain all downloaded MP3 files.
         Files are named according to their 'id' field in music.json (e.g., 'song-1.mp3')
     """
-    audio_dir = PROJECT_ROOT / "public" / "audio"
+    audio_dir = AUDIO_DIR
     audio_dir.mkdir(parents=True, exist_ok=True)
     print(f"📁 Audio directory: {audio_dir.absolute()}")
     return audio_dir
 
 
-def download_audio(url, output_id, audio_dir):
+# MP3 bitrate for sources that have to be re-encoded. Changing it marks every
+# re-encoded clip for `python -m tools recut`.
+BITRATE = '128k'
+
+# Source codecs every target browser plays natively, and the container a
+# stream-copied clip of each is written to. Anything else (Opus, Vorbis) is
+# re-encoded to MP3.
+COPYABLE = {'mp4a': '.m4a', 'mp3': '.mp3'}
+
+# An entry may list alternate URLs under "sources" (a re-upload, a
+# collaborator's channel, SoundCloud). When no running download has sent any
+# data within HEDGE_AFTER seconds, the next source is started alongside it;
+# the first to finish is kept and the others are cancelled.
+HEDGE_AFTER = 8.0
+
+# Sources are tried fastest first, by a moving average of time to first data
+# kept in tools/.cache/sources.json per source url and per host. A source's own
+# average ranks it when it has one, else its host's. LATENCY_ALPHA is the weight
+# of the newest observation. A failed attempt counts as FAILED_LATENCY against
+# that url only: one dead or private video says nothing about its host.
+LATENCY_ALPHA = 0.3
+FAILED_LATENCY = 30.0
+
+# Tallies for the summary: how many clips took each path, and the ffmpeg CPU
+# seconds each path used (POSIX only; None-safe on Windows).
+STATS = {'copied': 0, 'encoded': 0, 'copy_cpu': 0.0, 'encode_cpu': 0.0}
+
+
+def _child_cpu():
+    """CPU seconds used by finished child processes so far, or None on Windows."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def clip_seconds():
+    """Seconds kept from each song: the longest unlock time in settings.json."""
+    return max(load_settings()['times'])
+
+
+def copy_ext(acodec):
+    """Clip extension if a source in this codec can be stream-copied, else None."""
+    return COPYABLE.get((acodec or '').split('.')[0])
+
+
+def clip_params(acodec, seconds, start=0.0):
+    """
+    The parameters a clip is cut with, as recorded in tools/.cache/clips.json.
+    recut compares these with the ones a clip was actually cut with.
+    """
+    return {
+        'seconds': seconds,
+        'start': round(start, 2),
+        'bitrate': None if copy_ext(acodec) else BITRATE,
+    }
+
+
+def record_clips(made):
+    """Merge {clip id: how it was made} into tools/.cache/clips.json."""
+    with update_state('clips') as manifest:
+        manifest.update(made)
+
+
+def cut_clip(source, acodec, out_base, seconds, start=0.0, bitrate=BITRATE):
+    """
+    Cut `seconds` of `source`, from `start`, into out_base.<ext>.
+    
+    When the source codec is in COPYABLE the packets are copied untouched: no
+    decode, no re-encode, no extra generation of lossy artifacts. ffmpeg can
+    only stop a copy on a packet boundary, so the clip ends on the first AAC or
+    MP3 frame past `seconds` (at most ~26 ms long). Anything else is decoded
+    and encoded to MP3 at `bitrate`.
+    
+    Returns:
+        tuple: (clip path, True if stream-copied, ffmpeg CPU seconds or None)
+    """
+    ext = copy_ext(acodec)
+    if ext:
+        codec_args = ['-c:a', 'copy']
+        if ext == '.m4a':
+            codec_args += ['-movflags', '+faststart']  # playable before fully loaded
+    else:
+        codec_args = ['-c:a', 'libmp3lame', '-b:a', bitrate]
+    clip = out_base.with_name(out_base.name + (ext or '.mp3'))
+    
+    before = _child_cpu()
+    seek = ['-ss', str(start)] if start else []
+    proc = subprocess.run(
+        ['ffmpeg', '-v', 'error', '-y', *seek, '-i', str(source), '-vn', '-t', str(seconds),
+         *codec_args, str(clip)],
+        capture_output=True, text=True,
+    )
+    cpu = None if before is None else _child_cpu() - before
+    if proc.returncode != 0:
+        raise RuntimeError(f"cut failed: {proc.stderr.strip()[:80]}")
+    return clip, bool(ext), cpu
+
+
+def source_host(url):
+    """The host a source's speed is pooled under: youtu.be and m.youtube.com
+    count as youtube.com."""
+    host = (urlparse(url).hostname or '').lower()
+    for prefix in ('www.', 'm.', 'music.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return 'youtube.com' if host == 'youtu.be' else host
+
+
+def rank_sources(urls, latency):
+    """Order urls fastest observed first, by their own average or else their
+    host's; ties (and unseen sources, which go last) keep their music.json
+    order, so the primary url leads."""
+    def observed(url):
+        entry = latency.get('urls', {}).get(url) or latency.get('hosts', {}).get(source_host(url), {})
+        return entry.get('ewma', float('inf'))
+    return sorted(dict.fromkeys(urls), key=observed)
+
+
+def _update_ewma(table, key, seconds):
+    entry = table.setdefault(key, {'ewma': seconds, 'samples': 0})
+    if entry['samples']:
+        entry['ewma'] += LATENCY_ALPHA * (seconds - entry['ewma'])
+    else:
+        entry['ewma'] = seconds
+    entry['ewma'] = round(entry['ewma'], 3)
+    entry['samples'] += 1
+
+
+def record_latency(latency, url, seconds, failed=False):
+    """Fold one attempt into the url's average and, unless it failed, its host's."""
+    _update_ewma(latency.setdefault('urls', {}), url, seconds)
+    if not failed:
+        _update_ewma(latency.setdefault('hosts', {}), source_host(url), seconds)
+
+
+def hedged_fetch(urls, scratch, ydl_opts, hedge_after=HEDGE_AFTER):
     """
-    Download and convert audio from YouTube/SoundCloud using yt-dlp.
+    Download the source audio from whichever of `urls` finishes first.
+    
+    Sources are started one at a time in rank order. Each download reports its
+    first bytes through a yt-dlp progress hook; while none of the running ones
+    has, the next source is started every `hedge_after` seconds, and a source
+    that fails hands over to the next immediately. Once one finishes, the
+    others are cancelled from inside their progress hooks.
+    
+    Returns:
+        tuple: (winning url, source path, info dict from transport.ytdl_fetch)
+    
+    Raises:
+        The last source's error if every source failed.
+    """
+    # Replays keep the listed order and leave the latency table alone, so a
+    # fixture run is the same run every time.
+    replaying = transport.replaying()
+    urls = rank_sources(urls, {} if replaying else load_state('sources'))
+    events = queue.Queue()
+    cancel = threading.Event()
+    
+    def attempt(n, url):
+        reported = []
+        
+        def hook(progress):
+            if cancel.is_set():
+                raise transport.Cancelled(url)
+            if not reported and progress.get('downloaded_bytes'):
+                reported.append(True)
+                events.put(('data', n, None))
+        
+        try:
+            opts = dict(ydl_opts, progress_hooks=[hook])
+            path, info = transport.ytdl_fetch(url, opts, scratch / f'source-{n}')
+            if not path.exists():
+                raise RuntimeError("Download completed but file not found")
+            events.put(('done', n, (path, info)))
+        except Exception as e:
+            events.put(('error', n, e))
+    
+    started, first_data, failed, threads = {}, {}, set(), []
+    observed = []  # (url, seconds, failed), applied to the latency table at the end
+    
+    def launch():
+        n = len(started)
+        started[n] = time.monotonic()
+        if n:
+            print(f"  ↪️  Starting source {n + 1}: {urls[n][:50]}")
+        thread = threading.Thread(target=attempt, args=(n, urls[n]), daemon=True)
+        thread.start()
+        threads.append(thread)
+    
+    launch()
+    winner, error = None, None
+    while winner is None:
+        running = [n for n in started if n not in failed]
+        more = len(started) < len(urls)
+        if not running:
+            if not more:
+                break
+            launch()
+            continue
+        timeout = None
+        if more and not any(n in first_data for n in running):
+            timeout = max(0.0, started[len(started) - 1] + hedge_after - time.monotonic())
+        try:
+            kind, n, payload = events.get(timeout=timeout)
+        except queue.Empty:
+            launch()
+            continue
+        elapsed = time.monotonic() - started[n]
+        if kind == 'data':
+            first_data[n] = elapsed
+        elif kind == 'done':
+            first_data.setdefault(n, elapsed)
+            winner = (n, payload)
+        else:
+            failed.add(n)
+            error = payload
+            observed.append((urls[n], FAILED_LATENCY, True))
+            if len(urls) > 1:
+                print(f"  ⚠️  Source {n + 1} failed: {str(payload)[:60]}")
+            # Hand over at once, even if another source is still running.
+            if len(started) < len(urls):
+                launch()
+    
+    cancel.set()
+    now = time.monotonic()
+    for n in started:
+        if n in first_data:
+            observed.append((urls[n], first_data[n], False))
+        elif n not in failed:
+            # Cancelled before sending anything: at least this slow.
+            observed.append((urls[n], now - started[n], False))
+    if not replaying:
+        # Merged under the lock: queue workers download side by side.
+        with update_state('sources') as latency:
+            for url, seconds, failed_attempt in observed:
+                record_latency(latency, url, seconds, failed_attempt)
+    # Give cancelled downloads a moment to notice and stop writing into the
+    # scratch folder before the caller removes it.
+    for thread in threads:
+        thread.join(timeout=5)
+    
+    if winner is None:
+        raise error
+    n, (path, info) = winner
+    return urls[n], path, info
+
+
+def download_audio(url, output_id, audio_dir, sources=(), hedge_after=HEDGE_AFTER,
+                   cache_mb=source_cache.DEFAULT_CAP_MB):
+    """
+    Download audio from YouTube/SoundCloud with yt-dlp and cut a clip from it.
     
     Process:
-        1. Checks if file already exists (skips if present)
-        2. Downloads best available audio stream
-        3. Extracts and converts to MP3 (128 kbps)
-        4. Trims to first 32 seconds
-        5. Saves as {output_id}.mp3
+        1. Checks if a clip already exists (skips if present)
+        2. Takes the source from the source cache, or downloads the best audio
+           stream (preferring AAC or MP3) and adds it to the cache
+        3. Cuts the first clip_seconds() with ffmpeg: stream copy when the
+           source codec is browser-playable, otherwise re-encode to MP3
+        4. Saves as {output_id}.m4a (copied AAC) or {output_id}.mp3
     
     Args:
         url (str): YouTube or SoundCloud URL to download from
-        output_id (str): Filename identifier (without .mp3 extension)
-        audio_dir (Path): Directory to save the output MP3 file
+        output_id (str): Filename identifier (without extension)
+        audio_dir (Path): Directory to save the output clip
+        sources (list): Alternate URLs for the same recording, hedged with
+            `url` by hedged_fetch()
+        hedge_after (float): Seconds without data before trying another source
+        cache_mb (int): Size cap for the source cache
     
     Returns:
-        bool: True if download succeeded and file exists, False on any failure
+        dict: How the new clip was made, its tools/.cache/clips.json entry.
+            Recording it is left to the caller (record_clips()), so parallel
+            downloaders can hand it back instead of each rewriting the file.
+        True if the clip already exists, False on any failure.
     
     Note:
-        - Skips download if file already exists (returns True)
-        - Requires ffmpeg in PATH for audio conversion
+        - Skips download if a clip already exists
+        - Requires ffmpeg in PATH for cutting and conversion
         - Uses custom headers to avoid YouTube 403 blocks
-        - Sets 30-second socket timeout for reliability
+        - Sets 30-second socket timeout; hedging covers slower-than-that stalls
+        - Tallies copy/encode counts and ffmpeg CPU time in STATS
     """
-    import yt_dlp
-    
-    output_path = audio_dir / f"{output_id}.mp3"
+    DownloadError = transport.download_error_class()
     
     # Skip if already exists
-    if output_path.exists():
+    if find_clip(output_id, audio_dir):
         print(f"  ⏭️  Skipping (already exists)")
         return True
     
     try:
-        # Configure yt-dlp options with better headers to avoid 403 errors
+        # Configure yt-dlp options with better headers to avoid 403 errors.
+        # No postprocessors: the raw stream is cut by cut_clip() below, which
+        # can skip decoding entirely when the stream is already AAC or MP3.
         ydl_opts = {
-            'format': 'bestaudio/best',
-            'postprocessors': [{
-                'key': 'FFmpegExtractAudio',
-                'preferredcodec': 'mp3',
-                'preferredquality': '128',  # Reduced quality for smaller files
-            }],
-            'outtmpl': str(output_path.with_suffix('')),  # Without extension
+            'format': 'bestaudio[acodec^=mp4a]/bestaudio[acodec=mp3]/bestaudio/best',
             'quiet': True,
             'no_warnings': True,
             'socket_timeout': 30,
             'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'referer': 'https://www.youtube.com/',
             'nocheckcertificate': True,
-            'postprocessor_args': [
-                '-t', '32',  # Limit to first 32 seconds
-            ],
         }
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=True)
-            
-        if output_path.exists():
-            file_size = output_path.stat().st_size / (1024 * 1024)  # Convert to MB
-            print(f"  ✅ Downloaded ({file_size:.1f} MB)")
-            return True
-        else:
-            print(f"  ❌ Download completed but file not found")
-            return False
+        # Work in a scratch folder inside audio_dir so the finished clip can be
+        # renamed into place atomically; a crash never leaves half a clip.
+        with tempfile.TemporaryDirectory(prefix='.tmp-', dir=audio_dir) as tmp:
+            # Replays bypass the cache so they exercise the same path every time.
+            cached = None
+            if not transport.replaying():
+                for candidate in (url, *sources):
+                    cached = source_cache.lookup(candidate)
+                    if cached:
+                        used, (source, info) = candidate, cached
+                        print(f"  💾 Using cached source")
+                        break
+            if not cached:
+                used, source, info = hedged_fetch([url, *sources], Path(tmp), ydl_opts, hedge_after)
+                if not transport.replaying():
+                    source = source_cache.store(used, source, info, cache_mb)
+            params = clip_params(info.get('acodec'), clip_seconds())
+            clip, copied, cpu = cut_clip(source, info.get('acodec'), Path(tmp) / output_id,
+                                         params['seconds'], bitrate=BITRATE)
+            output_path = audio_dir / clip.name
+            os.replace(clip, output_path)
+        made = dict(params, url=used, acodec=info.get('acodec'), copied=copied)
+        
+        STATS['copied' if copied else 'encoded'] += 1
+        if cpu is not None:
+            STATS['copy_cpu' if copied else 'encode_cpu'] += cpu
+        file_size = output_path.stat().st_size / (1024 * 1024)  # Convert to MB
+        how = "stream copy" if copied else "re-encoded"
+        via = f", via {source_host(used)}" if used != url else ""
+        print(f"  ✅ Downloaded ({file_size:.1f} MB, {how}{via})")
+        return made
             
-    except yt_dlp.utils.DownloadError as e:
+    except DownloadError as e:
         error_str = str(e).lower()
         if "ffmpeg" in error_str or "ffprobe" in error_str:
             print(f"  ❌ ffmpeg/ffprobe not found")
@@ -254,7 +559,32 @@ def download_audio(url, output_id, audio_dir):
             return False
 
 
-def main():
+def print_transcode_summary():
+    """
+    Report how many clips skipped re-encoding and the CPU time that saved.
+    
+    The saving is estimated from the average CPU cost of a re-encode, which is
+    remembered across runs in tools/.cache/transcode.json so it can still be
+    estimated on a run where every clip was copied.
+    """
+    copied, encoded = STATS['copied'], STATS['encoded']
+    if not copied and not encoded:
+        return
+    if encoded and _child_cpu() is not None:
+        with update_state('transcode', {'encodes': 0, 'encode_cpu': 0.0}) as history:
+            history['encodes'] += encoded
+            history['encode_cpu'] += STATS['encode_cpu']
+    else:
+        history = load_state('transcode', {'encodes': 0, 'encode_cpu': 0.0})
+    
+    print(f"⚡ Stream-copied: {copied} of {copied + encoded} clips (no re-encode)")
+    if copied and history['encodes']:
+        per_encode = history['encode_cpu'] / history['encodes']
+        saved = max(0.0, copied * per_encode - STATS['copy_cpu'])
+        print(f"   CPU time saved: ~{saved:.1f}s ({per_encode:.2f}s per re-encode avoided)")
+
+
+def main(argv=None):
     """
     Main orchestration function for the download process.
     
@@ -273,6 +603,20 @@ def main():
     The function tracks success/failure/skip counts and only indicates
     deployment readiness when all required downloads complete successfully.
     """
+    ap = argparse.ArgumentParser(
+        prog="python -m tools download",
+        description="Download a clip for every music.json entry that lacks one.",
+    )
+    ap.add_argument('--hedge-after', type=float, default=HEDGE_AFTER, metavar='SECONDS',
+                    help=f"start an entry's next source after this long without data "
+                         f"(default {HEDGE_AFTER:g})")
+    ap.add_argument('--cache-mb', type=int, default=source_cache.DEFAULT_CAP_MB, metavar='MB',
+                    help="size cap for the full-length source cache, least recently used "
+                         f"evicted first (default {source_cache.DEFAULT_CAP_MB})")
+    args = ap.parse_args(argv)
+
+    utf8_console()
+
     print("=" * 60)
     print("🎵 YouTube Audio Downloader (yt-dlp)")
     print("=" * 60)
@@ -326,17 +670,21 @@ def main():
         print(f"\n[{i}/{len(valid_entries)}] {title}")
         print(f"    ID: {track_id}")
         print(f"    URL: {url[:50]}...")
+        sources = track.get('sources', [])
+        if sources:
+            print(f"    + {len(sources)} alternate source(s)")
         
         # Check if already exists
-        output_path = audio_dir / f"{track_id}.mp3"
-        if output_path.exists():
+        if find_clip(track_id, audio_dir):
             skipped += 1
             print(f"    ⏭️  Already exists")
             continue
         
         # Download
-        if download_audio(url, track_id, audio_dir):
+        made = download_audio(url, track_id, audio_dir, sources, args.hedge_after, args.cache_mb)
+        if made:
             successful += 1
+            record_clips({track_id: made})
         else:
             failed += 1
     
@@ -349,6 +697,9 @@ def main():
     print(f"⏭️  Skipped:    {skipped} (already existed)")
     print(f"❌ Failed:     {failed}")
     print(f"📁 Location:   {audio_dir.absolute()}")
+    print_transcode_summary()
+    count, size = source_cache.usage()
+    print(f"💾 Source cache: {count} songs, {size / (1024 * 1024):.0f} of {args.cache_mb} MB")
     print()
     
     # Calculate total songs that should be present
@@ -377,7 +728,9 @@ def main():
         print("  1. Run: node scripts/update-music-ids.js")
         print("  2. Verify audio files in public/audio/")
         print("  3. Test locally: npm run dev")
-        print("  4. Deploy to Vercel (push to GitHub or run: vercel --prod)")
+        print("  4. See what changed since the last deploy: python -m tools deploy")
+        print("  5. Deploy to Vercel (push to GitHub or run: vercel --prod)")
+        print("  6. Record the deploy: python -m tools deploy --mark-deployed")
         print()
     else:
         print("⚠️  Unexpected state - please verify audio files manually")
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Sam Bowman Heardle - Re-cut Clips from Cached Sources
+
+Regenerates the clips in public/audio/ whose cut parameters no longer match
+what they should be, from the full-length sources download_audio.py keeps in
+tools/.cache/source-audio/. Nothing is downloaded.
+
+A clip is re-cut when any of these differ from tools/.cache/clips.json, which
+records how each clip was made:
+
+  seconds   the longest unlock time in settings.json
+  bitrate   download_audio.BITRATE, for clips that had to be re-encoded
+  start     the clip's offset into the source. When tools/analyze_audio.py has
+            found a leading silence in the current clip, the clip is re-cut
+            that much later in the source, keeping its full length.
+
+Cuts run in a process pool, one ffmpeg per worker. Clips without a cached
+source (downloaded before the cache existed, or since evicted) are listed;
+delete one and run download_audio.py to bring it under recut. Re-cut clips
+keep their sidecars, but with start zeroed so the player does not skip the
+silence the cut already removed; re-run `python -m tools analyze` afterwards
+so the sidecars describe the new clips.
+
+USAGE
+
+    python -m tools recut              # re-cut everything that changed
+    python -m tools recut --dry-run    # only list what would change
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/recut.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools import source_cache
+from tools.analyze_audio import sha256
+from tools.common import (
+    AUDIO_DIR,
+    CLIP_EXTS,
+    META_DIR,
+    find_clip,
+    load_music,
+    load_state,
+    update_state,
+    utf8_console,
+)
+from tools.download_audio import BITRATE, clip_params, clip_seconds, cut_clip, record_clips
+
+PARAMS = ("seconds", "start", "bitrate")
+
+
+def wanted(clip_id, clip, made, acodec, seconds, analysis):
+    """The parameters this clip should have been cut with."""
+    start = made.get("start", 0.0) if made else 0.0
+    silence = analysis.get(clip_id)
+    # analysis.json describes the clip as it was analysed; once the clip's
+    # bytes change (e.g. by this very re-cut) its start no longer applies.
+    if clip and isinstance(silence, dict) and silence.get("start") and silence.get("sha256") == sha256(clip):
+        start += silence["start"]
+    return clip_params(acodec, seconds, start)
+
+
+def recut_one(clip_id, source, acodec, params, audio_dir):
+    """Process-pool worker: cut one clip from its source and swap it into place."""
+    with tempfile.TemporaryDirectory(prefix=".tmp-", dir=audio_dir) as tmp:
+        clip, copied, _ = cut_clip(
+            source, acodec, Path(tmp) / clip_id, params["seconds"], params["start"], params["bitrate"] or BITRATE
+        )
+        out = audio_dir / clip.name
+        os.replace(clip, out)
+    # A re-encode can change the format (.m4a -> .mp3 or back); drop the old one
+    # so find_clip and /api/audio pick up the new clip.
+    for ext in CLIP_EXTS:
+        stale = audio_dir / f"{clip_id}{ext}"
+        if stale != out and stale.exists():
+            stale.unlink()
+    return copied
+
+
+def forget_analysis(clip_ids):
+    """
+    Drop what analyze knew about re-cut clips until it runs again.
+
+    A start folded into the new cut must not be skipped a second time by the
+    player, so the sidecar's start is zeroed (its gain and peaks are still
+    close enough to use), and the analysis.json entries, which describe the
+    old bytes, are removed.
+    """
+    for clip_id in clip_ids:
+        path = META_DIR / f"{clip_id}.json"
+        try:
+            meta = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            continue
+        if meta.get("start"):
+            meta["start"] = 0
+            path.write_text(json.dumps(meta, separators=(",", ":")) + "\n", encoding="utf-8")
+    if clip_ids:
+        with update_state("analysis") as analysis:
+            for clip_id in clip_ids:
+                analysis.pop(clip_id, None)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools recut",
+        description="Re-cut clips whose parameters changed, from cached source audio.",
+    )
+    ap.add_argument("--dry-run", action="store_true", help="list what would be re-cut")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 2, help="worker processes")
+    args = ap.parse_args(argv)
+    utf8_console()
+
+    manifest = load_state("clips")
+    analysis = load_state("analysis")
+    seconds = clip_seconds()
+
+    todo, uncached = [], []
+    for track in load_music():
+        clip_id = track.get("id")
+        if not clip_id:
+            continue
+        clip = find_clip(clip_id)
+        made = manifest.get(clip_id)
+        cached = source_cache.lookup(made["url"] if made else track.get("url", ""), touch=False)
+        if not cached:
+            if clip and not made:
+                uncached.append(clip_id)
+            continue
+        source, info = cached
+        params = wanted(clip_id, clip, made, info.get("acodec"), seconds, analysis)
+        current = {k: made.get(k) for k in PARAMS} if made else None
+        if clip and current == params:
+            continue
+        todo.append((clip_id, source, info, params, current))
+
+    print(f"✂️  {len(todo)} clips to re-cut ({seconds}s clips, {BITRATE} re-encodes)")
+    for clip_id, _, _, params, current in todo:
+        if current is None:
+            print(f"  {clip_id}: not cut from the cache yet")
+        else:
+            changes = ", ".join(f"{k} {current[k]} -> {params[k]}" for k in PARAMS if current[k] != params[k])
+            print(f"  {clip_id}: {changes}")
+    if uncached:
+        print(f"\n⚠️  {len(uncached)} clips have no cached source and cannot be re-cut:")
+        print("   " + ", ".join(uncached))
+        print("   Delete a clip and run python tools/download_audio.py to cache its source.")
+    if args.dry_run or not todo:
+        return 0
+
+    # A cut is a use, for LRU eviction. Mark the sources before cutting, so a
+    # download running meanwhile does not evict one out from under its cut.
+    for _, _, info, _, _ in todo:
+        source_cache.lookup(info["url"])
+
+    failed, cut = 0, {}
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {
+            pool.submit(recut_one, clip_id, source, info.get("acodec"), params, AUDIO_DIR): (clip_id, source, info, params)
+            for clip_id, source, info, params, _ in todo
+        }
+        for fut in as_completed(futures):
+            clip_id, source, info, params = futures[fut]
+            try:
+                copied = fut.result()
+            except RuntimeError as e:
+                print(f"  ❌ {clip_id}: {e}")
+                failed += 1
+                continue
+            url = manifest.get(clip_id, {}).get("url", info["url"])
+            cut[clip_id] = dict(params, url=url, acodec=info.get("acodec"), copied=copied)
+            print(f"  ✅ {clip_id}")
+    record_clips(cut)
+    forget_analysis(cut)
+
+    print(f"\n✅ Re-cut {len(todo) - failed} clips. Now run: python -m tools analyze")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Cancelled")
+        sys.exit(130)
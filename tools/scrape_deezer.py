@@ -20,33 +20,30 @@ You are responsible for:
 The authors assume NO LIABILITY for misuse of this tool.
 
 ────────────────────────────────────────────────────────────────────────────────
+
+Usage:
+    python -m tools art
+    python tools/scrape_deezer.py
 """
 
-import json
-import os
+import argparse
 import sys
-import requests
 import time
 from pathlib import Path
 from urllib.parse import quote
 
-# Force UTF-8 encoding for Windows console
-if sys.platform == 'win32':
-    import io
-    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
-    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
+if __package__ in (None, ""):
+    # Run as a script (python tools/scrape_deezer.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-SCRIPT_DIR = Path(__file__).parent
-PROJECT_ROOT = SCRIPT_DIR.parent
-MUSIC_JSON_PATH = PROJECT_ROOT / "src" / "settings" / "music.json"
+from tools.common import ARTIST_NAME, MusicLocked, load_music, music_lock, save_music, utf8_console
 
-# Load the existing music.json
-with open(MUSIC_JSON_PATH, 'r', encoding='utf-8') as f:
-    music_data = json.load(f)
 
 # Function to search Deezer and get album art
 def get_deezer_art(title):
-    query = f'artist:"Sam Bowman" track:"{title}"'
+    import requests  # deferred: only the art command needs it
+
+    query = f'artist:"{ARTIST_NAME}" track:"{title}"'
     encoded_query = quote(query)
     url = f'https://api.deezer.com/search?q={encoded_query}'
     try:
@@ -61,23 +58,46 @@ def get_deezer_art(title):
         print(f"Error fetching data for {title}: {e}")
     return None
 
-# Update each song
-for i, item in enumerate(music_data):
-    title = item.get('title', '')
-    print(f"Processing {i+1}/{len(music_data)}: {title}")
-    
-    album_art = get_deezer_art(title)
-    if album_art:
-        item['art'] = album_art
-        print(f"  Updated art: {album_art}")
-    else:
-        print(f"  No data found, keeping original")
-    
-    # Sleep to avoid rate limiting
-    time.sleep(0.5)
-
-# Save the updated music.json
-with open(MUSIC_JSON_PATH, 'w', encoding='utf-8') as f:
-    json.dump(music_data, f, indent=2, ensure_ascii=False)
-
-print("Updated music.json with album art from Deezer.")
\ No newline at end of file
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools art",
+        description="Refresh album art URLs in music.json from Deezer.",
+    )
+    ap.parse_args(argv)
+    utf8_console()
+
+    # The whole read-modify-write holds the music.json lock, so a daemon cycle
+    # (or a sync) cannot add or repair tracks in the meantime and be overwritten.
+    try:
+        with music_lock():
+            music_data = load_music()
+
+            # Update each song
+            for i, item in enumerate(music_data):
+                title = item.get('title', '')
+                print(f"Processing {i+1}/{len(music_data)}: {title}")
+
+                album_art = get_deezer_art(title)
+                if album_art:
+                    item['art'] = album_art
+                    print(f"  Updated art: {album_art}")
+                else:
+                    print(f"  No data found, keeping original")
+
+                # Sleep to avoid rate limiting
+                time.sleep(0.5)
+
+            # Save the updated music.json
+            save_music(music_data)
+    except MusicLocked as e:
+        print(f"❌ {e}")
+        return 1
+
+    print("Updated music.json with album art from Deezer.")
+    print("Now run: python -m tools songs   # the site reads art from public/songs/")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
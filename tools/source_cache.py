@@ -0,0 +1,129 @@
+"""
+Local cache of full-length source audio, so clips can be re-cut without
+downloading anything again.
+
+download_audio.py keeps every source it fetches here, keyed by video ID, and
+`python -m tools recut` cuts new clips from it when the unlock schedule, the
+bitrate or a clip's start offset changes. The cache lives in
+tools/.cache/source-audio/ as <key>.<ext> plus a <key>.json holding the url and
+codec. It is capped in size (--cache-mb, default DEFAULT_CAP_MB) and evicts the
+least recently used sources first; using a source for a cut counts as a use.
+Sources used within EVICT_GRACE are never evicted, so a download in one process
+cannot delete a source another (a queue worker, a recut) is about to cut.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from urllib.parse import parse_qs, urlparse
+
+from tools.common import CACHE_DIR
+
+SOURCE_DIR = CACHE_DIR / "source-audio"
+
+# A full song is 3-8 MB at YouTube's usual audio bitrates, so this holds a few
+# hundred: the whole catalog, for most Heardles.
+DEFAULT_CAP_MB = 2048
+
+# Seconds after its last use during which a source is kept even over the cap.
+EVICT_GRACE = 3600
+
+
+def source_key(url):
+    """Cache key for a source url: the YouTube video ID, else a hash of the url."""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if host.endswith("youtu.be"):
+        video = parsed.path.strip("/")
+    elif "youtube.com" in host:
+        video = parse_qs(parsed.query).get("v", [""])[0]
+    else:
+        video = ""
+    if video:
+        return f"yt-{video}"
+    return "url-" + hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+
+def _meta_path(key):
+    return SOURCE_DIR / f"{key}.json"
+
+
+def lookup(url, touch=True):
+    """(source path, info) for a cached url, or None. Marks the entry as used
+    unless touch is False."""
+    key = source_key(url)
+    try:
+        info = json.loads(_meta_path(key).read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return None
+    path = SOURCE_DIR / f"{key}.{info['ext']}"
+    try:
+        if touch:
+            os.utime(path)  # LRU order is file mtime
+        elif not path.exists():
+            return None
+    except FileNotFoundError:  # evicted by another process just now
+        return None
+    return path, info
+
+
+def store(url, path, info, cap_mb=DEFAULT_CAP_MB):
+    """
+    Move a freshly downloaded source into the cache, then evict down to cap_mb.
+    Returns the cached path. The new source itself is never evicted by its own
+    store, even if it alone is over the cap.
+    """
+    SOURCE_DIR.mkdir(parents=True, exist_ok=True)
+    key = source_key(url)
+    cached = SOURCE_DIR / f"{key}.{info['ext']}"
+    shutil.move(str(path), str(cached))  # scratch dirs may be on another disk
+    # The move keeps the download's mtime, which yt-dlp sets to the server's
+    # Last-Modified; LRU order needs "used now".
+    os.utime(cached)
+    _meta_path(key).write_text(
+        json.dumps({"url": url, "acodec": info.get("acodec"), "ext": info["ext"]}) + "\n",
+        encoding="utf-8",
+    )
+    evict(cap_mb, keep=cached)
+    return cached
+
+
+def entries():
+    """[(path, size, mtime)] for every cached source, oldest use first."""
+    if not SOURCE_DIR.is_dir():
+        return []
+    found = []
+    for path in SOURCE_DIR.iterdir():
+        if path.suffix != ".json" and not path.name.startswith("."):
+            stat = path.stat()
+            found.append((path, stat.st_size, stat.st_mtime))
+    found.sort(key=lambda e: e[2])
+    return found
+
+
+def evict(cap_mb, keep=None):
+    """Delete least recently used sources until the cache fits in cap_mb, sparing
+    those used in the last EVICT_GRACE seconds. Returns the number removed."""
+    cached = entries()
+    total = sum(size for _, size, _ in cached)
+    cap = cap_mb * 1024 * 1024
+    recent = time.time() - EVICT_GRACE
+    removed = 0
+    for path, size, mtime in cached:
+        if total <= cap or mtime > recent:
+            break  # oldest first: everything after this is recent too
+        if path == keep:
+            continue
+        path.unlink(missing_ok=True)  # another process may have evicted it
+        _meta_path(path.stem).unlink(missing_ok=True)
+        total -= size
+        removed += 1
+    return removed
+
+
+def usage():
+    """(number of sources, total bytes) currently cached."""
+    cached = entries()
+    return len(cached), sum(size for _, size, _ in cached)
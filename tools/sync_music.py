@@ -22,19 +22,32 @@ HOW IT WORKS
      important trick: per-track YouTube *search* is unreliable and frequently
      returns unrelated videos, but the channel listing is exact. Search is only
      used as a fallback for collabs hosted on a collaborator's channel.
+     Steps 1 and 2 run at the same time: once Deezer yields the first new
+     track, the channel is listed in the background while albums keep
+     streaming in, so a sync takes as long as the slower of the two rather
+     than both added together. With nothing new, the channel is not listed.
   3. Matches Deezer tracks to YouTube videos by normalized title, requiring the
      durations to agree within DURATION_TOLERANCE seconds. A title that matches
      but whose duration does not is reported, never auto-applied.
+     Search results are cached in tools/.cache/search.json, for SEARCH_HIT_TTL
+     days when they produced a match and SEARCH_MISS_TTL days when they did
+     not, so repeated dry runs do not search again.
   4. Prints a report. With --apply, appends confident matches to music.json.
 
 Nothing is written without --apply.
 
 USAGE
 
+    python -m tools sync                          # same, via the unified CLI
     python tools/sync_music.py                    # dry run: show what's new
     python tools/sync_music.py --since 2026-01-01 # only releases after a date
     python tools/sync_music.py --apply            # write new entries
     python tools/sync_music.py --verify           # check existing URLs still play
+    python tools/sync_music.py --repair           # re-match videos taken down
+    python tools/sync_music.py --refresh-search "Title"   # re-search one title
+
+    Set HEARDLE_TRANSPORT=record:<zip> or replay:<zip> to capture a run or
+    replay it offline; see tools/transport.py.
 
     After --apply, download the new clips:
         python tools/download_audio.py
@@ -44,25 +57,44 @@ REQUIREMENTS
     Python 3.8+ (standard library only)
 
 CONFIG
-    Both IDs below are for this project's artist. Point them somewhere else to
-    reuse this script for a different Heardle.
+    The artist IDs live in tools/common.py. Point them somewhere else to reuse
+    the tools for a different Heardle.
 """
 
 import argparse
+import contextlib
 import json
-import re
 import subprocess
 import sys
+import threading
 import time
-import urllib.parse
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+from urllib.parse import quote
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/sync_music.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools import transport
+from tools.common import (
+    ARTIST_NAME,
+    DEEZER_ARTIST_ID,
+    YOUTUBE_CHANNEL,
+    MusicLocked,
+    load_music,
+    load_state,
+    match_key,
+    music_lock,
+    save_music,
+    save_state,
+    slugify,
+    title_keys,
+)
 
 # --- Configuration -----------------------------------------------------------
-
-ARTIST_NAME = "Sam Bowman"
-DEEZER_ARTIST_ID = 11145178
-YOUTUBE_CHANNEL = "https://www.youtube.com/channel/UC4-DeiRFx7RPhooKaFAYXdA"
+#
+# The artist IDs live in tools/common.py, shared by every tool.
 
 # A YouTube upload is accepted as "the same recording" only if its runtime is
 # within this many seconds of Deezer's. Lyric videos often carry a few seconds of
@@ -70,9 +102,15 @@ YOUTUBE_CHANNEL = "https://www.youtube.com/channel/UC4-DeiRFx7RPhooKaFAYXdA"
 # enough to reject a different mix or a full-album upload.
 DURATION_TOLERANCE = 12
 
-SCRIPT_DIR = Path(__file__).parent
-PROJECT_ROOT = SCRIPT_DIR.parent
-MUSIC_JSON = PROJECT_ROOT / "src" / "settings" / "music.json"
+# YouTube search fallback results are cached per normalized query. A result
+# that gave a confident match is kept for SEARCH_HIT_TTL days; one that did not
+# (typically a collab with no upload yet) is retried after SEARCH_MISS_TTL.
+SEARCH_HIT_TTL = 30
+SEARCH_MISS_TTL = 3
+
+# Threads for a sync: one lists the channel, the rest match new tracks (and run
+# their search fallbacks) while the Deezer crawl is still going.
+SYNC_WORKERS = 4
 
 # Deezer lists a lot of duplicate/regional re-releases. Skip albums whose title
 # matches these (case-insensitive substring).
@@ -89,6 +127,12 @@ TITLE_SKIP = ()
 
 def deezer(path):
     """GET a Deezer API path, with retries. Returns {} on persistent failure."""
+    return transport.call("deezer", path, lambda: _deezer_live(path))
+
+
+def _deezer_live(path):
+    import urllib.request  # ~40 ms of ssl/http imports; only pay it when fetching
+
     url = f"https://api.deezer.com/{path}"
     for attempt in range(4):
         try:
@@ -105,55 +149,35 @@ def deezer(path):
     return {}
 
 
-def match_key(title):
-    """
-    Aggressively normalize a track title so Deezer and YouTube spellings collide.
-
-    Deezer and YouTube disagree constantly on case, punctuation, and suffixes
-    like "(from Young Pop Renegades, Vol. 2)", so all of that is stripped. This
-    key is ONLY for matching -- never write it back to music.json.
-    """
-    t = title.lower()
-    t = re.sub(r"\(from [^)]*\)", " ", t)
-    t = re.sub(r"\[(official|lyric)[^\]]*\]", " ", t)
-    t = re.sub(r"\((official|lyric|audio|visualizer)[^)]*\)", " ", t)
-    # Drop guest credits entirely, names included. music.json often stores a
-    # bare "Spark" where YouTube has "Spark (feat. Rapture Ruckus)"; keeping the
-    # guest's name would make those two titles never agree.
-    t = re.sub(r"[\(\[]\s*(feat|ft)\.?[^)\]]*[\)\]]", " ", t)
-    t = t.replace("&", " and ")
-    t = re.sub(r"\bfeat\.?\b|\bft\.?\b", " ", t)
-    t = re.sub(r"[^a-z0-9]+", "", t)
-    return t
-
-
-def slugify(title):
+def yt_dlp(args, timeout=420):
     """
-    Port of scripts/update-music-ids.js.
+    Run yt-dlp, returning its stdout, or None if it failed or timed out without
+    printing anything. Never raises.
 
-    MUST stay byte-identical to that implementation: the id becomes the audio
-    filename (public/audio/<id>.mp3), so any drift silently breaks playback.
-    JavaScript's \\w is ASCII-only, hence re.ASCII here.
+    Output is returned even when yt-dlp exits non-zero, which it does when a
+    single entry of a listing is unavailable; callers decide what counts as
+    success.
     """
-    s = title.lower().strip()
-    s = re.sub(r"[^\w\s-]", "", s, flags=re.ASCII)
-    s = re.sub(r"\s+", "-", s)
-    s = re.sub(r"-+", "-", s)
-    return s
+    return transport.call("yt-dlp", args, lambda: _yt_dlp_live(args, timeout))
 
 
-def yt_dlp(args, timeout=420):
-    """Run yt-dlp, returning stdout ('' on failure). Never raises."""
+def _run_yt_dlp(args, timeout):
+    """(returncode, stdout, stderr) of a yt-dlp run; a timeout is (None, '', '')."""
     try:
         proc = subprocess.run(
             ["yt-dlp", *args], capture_output=True, text=True, timeout=timeout
         )
-        return proc.stdout
+        return proc.returncode, proc.stdout, proc.stderr
     except FileNotFoundError:
         print("❌ yt-dlp not found on PATH. Install it: brew install yt-dlp")
         sys.exit(1)
     except subprocess.TimeoutExpired:
-        return ""
+        return None, "", ""
+
+
+def _yt_dlp_live(args, timeout):
+    code, out, _ = _run_yt_dlp(args, timeout)
+    return out if out.strip() or code == 0 else None
 
 
 SEP = "\x1f"  # unit separator: safe against titles containing | or tabs
@@ -179,10 +203,20 @@ def parse_yt_lines(raw):
 
 def fetch_deezer_catalog(since=None):
     """Return [{title, album, record_type, release, duration, art}] newest first."""
+    return list(iter_deezer_catalog(since))
+
+
+def iter_deezer_catalog(since=None):
+    """
+    Yield {title, album, record_type, release, duration, art}, newest first.
+
+    Tracks are yielded album by album as each album's detail arrives, so the
+    caller can start matching long before the (rate-limited) crawl finishes.
+    """
     albums = deezer(f"artist/{DEEZER_ARTIST_ID}/albums?limit=300").get("data", [])
     albums.sort(key=lambda a: a.get("release_date", ""), reverse=True)
 
-    tracks, seen = [], set()
+    seen = set()
     for alb in albums:
         release = alb.get("release_date", "")
         if since and release < since:
@@ -199,7 +233,7 @@ def fetch_deezer_catalog(since=None):
             if any(s.lower() in tr["title"].lower() for s in TITLE_SKIP):
                 continue
             seen.add(key)
-            tracks.append(
+            yield (
                 {
                     "title": tr["title"],
                     # Standalone singles are recorded as album "Single" to match
@@ -213,7 +247,41 @@ def fetch_deezer_catalog(since=None):
                     "art": alb.get("cover_medium"),
                 }
             )
-    return tracks
+
+
+def track_durations(titles, full_crawl=False):
+    """
+    Deezer runtimes for `titles`, as {match_key: seconds or None}.
+
+    Answered from tools/.cache/durations.json, which every sync refreshes with
+    each track it sees. Titles not in the table get one targeted Deezer search
+    each, so the cost scales with the number of titles asked about rather than
+    the size of the discography. full_crawl rebuilds the whole table from the
+    album-by-album crawl instead, for when search comes up short.
+    """
+    table = load_state("durations")
+    if full_crawl:
+        print("Crawling the full Deezer discography for runtimes...")
+        for track in iter_deezer_catalog():
+            table[match_key(track["title"])] = track["duration"]
+
+    out = {}
+    for title in titles:
+        key = match_key(title)
+        if key not in table:
+            query = quote(f'artist:"{ARTIST_NAME}" track:"{title}"')
+            hits = [
+                h for h in deezer(f"search?q={query}&limit=10").get("data", [])
+                if match_key(h.get("title", "")) == key
+            ]
+            # Prefer the artist's own release; collabs may be filed under the
+            # collaborator, which is still the same recording.
+            hits.sort(key=lambda h: h.get("artist", {}).get("id") != DEEZER_ARTIST_ID)
+            if hits:
+                table[key] = hits[0].get("duration")
+        out[key] = table.get(key)
+    save_state("durations", table)
+    return out
 
 
 def fetch_channel_videos():
@@ -227,10 +295,12 @@ def fetch_channel_videos():
             f"%(id)s{SEP}%(duration)s{SEP}%(title)s",
         ]
     )
-    return parse_yt_lines(raw)
+    return parse_yt_lines(raw or "")
 
 
 def search_youtube(query, n=5):
+    """Top n results for query: [{id, duration, title}], or None if the search
+    itself failed (offline, throttled, timed out) as opposed to finding nothing."""
     raw = yt_dlp(
         [
             f"ytsearch{n}:{query}",
@@ -241,29 +311,61 @@ def search_youtube(query, n=5):
         ],
         timeout=240,
     )
-    return parse_yt_lines(raw)
+    return None if raw is None else parse_yt_lines(raw)
 
 
-# --- Matching ----------------------------------------------------------------
-
-
-def title_keys(video_title):
+class SearchCache:
     """
-    Every plausible normalized key for a YouTube title.
+    Persistent cache of search_youtube() results, keyed by match_key(query).
 
-    Collabs are usually uploaded to the *collaborator's* channel and titled
-    "Matthew Parker & Sam Bowman - Gravity Strikes Again (Official Lyric Video)".
-    Matching the whole string against "Gravity Strikes Again" fails, so we also
-    offer the text after each artist separator as a candidate key.
+    Shared by the sync's worker threads, hence the lock; saved once per run.
+    Only used for live runs: recording and replaying must issue every search.
+    A search that failed is never cached, or one offline run would hide every
+    collab for SEARCH_MISS_TTL days.
     """
-    keys = {match_key(video_title)}
-    for sep in (" - ", " | ", " – ", " — ", ": "):
-        if sep in video_title:
-            head, _, tail = video_title.partition(sep)
-            keys.add(match_key(tail))
-            keys.add(match_key(video_title.rsplit(sep, 1)[-1]))
-    keys.discard("")
-    return keys
+
+    def __init__(self):
+        self.entries = load_state("search")
+        self.lock = threading.Lock()
+        self.enabled = transport.MODE == "live"
+        self.failed = 0
+
+    def search_pick(self, query, track, refresh=False):
+        """pick() over the results for `query`, searching only on a cache miss."""
+        key = match_key(query)
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry and self.enabled and not refresh:
+            ttl = SEARCH_HIT_TTL if entry["hit"] else SEARCH_MISS_TTL
+            if now - entry["at"] < ttl * 86400:
+                return pick(entry["results"], track)
+        results = search_youtube(query)
+        if results is None:
+            with self.lock:
+                self.failed += 1
+            return None
+        vid = pick(results, track)
+        with self.lock:
+            self.entries[key] = {"at": now, "hit": vid is not None, "results": results}
+        return vid
+
+    def save(self):
+        if self.failed:
+            print(f"⚠️  {self.failed} YouTube searches failed (offline or throttled?); "
+                  "re-run to search for those songs again")
+        if not self.enabled:
+            return
+        now = time.time()
+        with self.lock:
+            live = {
+                k: e for k, e in self.entries.items()
+                if now - e["at"] < (SEARCH_HIT_TTL if e["hit"] else SEARCH_MISS_TTL) * 86400
+            }
+        save_state("search", live)
+
+
+# --- Matching ----------------------------------------------------------------
 
 
 def pick(candidates, track):
@@ -298,12 +400,36 @@ def pick(candidates, track):
 # --- Commands ----------------------------------------------------------------
 
 
+# What yt-dlp says about a video that is definitely gone. Anything else that
+# prints no video ID (network errors, timeouts, "confirm you're not a bot"
+# throttling) says nothing about the video itself.
+DEAD_VIDEO = (
+    "video unavailable",
+    "private video",
+    "has been removed",
+    "no longer available",
+    "account associated with this video has been terminated",
+)
+
+
 def url_alive(url):
-    """True if YouTube still serves this video."""
-    return bool(yt_dlp(["--skip-download", "--print", "%(id)s", url], timeout=90).strip())
+    """
+    True if YouTube still serves this video, False if it definitely does not,
+    None if yt-dlp could not tell (offline, throttled, timed out). Callers must
+    treat None as "check again later", never as dead.
+    """
+    code, out, err = transport.call(
+        "yt-dlp-probe", url,
+        lambda: list(_run_yt_dlp(["--skip-download", "--print", "%(id)s", url], 90)),
+    )
+    if out.strip():
+        return True
+    if code is not None and any(m in err.lower() for m in DEAD_VIDEO):
+        return False
+    return None
 
 
-def cmd_repair(music, apply):
+def cmd_repair(music, apply, full_crawl=False):
     """
     Find replacement URLs for entries whose video has been taken down.
 
@@ -313,31 +439,58 @@ def cmd_repair(music, apply):
     using the same title+duration rules as the sync.
     """
     print(f"Checking {len(music)} URLs...")
-    dead = [t for t in music if not t.get("url") or not url_alive(t["url"])]
+    dead, unknown = [], []
+    for track in music:
+        alive = url_alive(track["url"]) if track.get("url") else False
+        if alive is False:
+            dead.append(track)
+        elif alive is None:
+            unknown.append(track)
     print(f"  {len(dead)} dead\n")
+    if unknown:
+        print(f"⚠️  {len(unknown)} could not be checked (offline or throttled?); re-run to retry them\n")
     if not dead:
         print("✅ Nothing to repair.")
         return 0
 
+    fixed, unfixed = repair_dead(music, dead, apply, full_crawl)
+    if not apply:
+        print(f"\n(dry run -- {len(fixed)} repairable. Re-run with --apply to write.)")
+        return 0
+    print(f"\n✅ Repaired {len(fixed)} URLs. {len(unfixed)} still need manual attention.")
+    print("Now run: python -m tools songs && python tools/download_audio.py")
+    return 0
+
+
+def repair_dead(music, dead, apply, full_crawl=False):
+    """
+    Re-match the `dead` entries of `music`; with apply, write the fixes.
+
+    Returns (fixed, unfixed): fixed is [(track, video)], unfixed is [track].
+    Shared by --repair and the maintenance daemon, which already knows which
+    entries are dead and should not re-check the whole catalog to find out.
+    """
     # Deezer runtimes let us reject a same-titled but different recording.
-    durations = {}
-    for alb in deezer(f"artist/{DEEZER_ARTIST_ID}/albums?limit=300").get("data", []):
-        for tr in deezer(f"album/{alb['id']}").get("tracks", {}).get("data", []):
-            durations.setdefault(match_key(tr["title"]), tr.get("duration"))
-        time.sleep(0.15)
+    durations = track_durations([t["title"] for t in dead], full_crawl)
 
     print("Listing the artist's YouTube channel...")
     channel = fetch_channel_videos()
     print(f"  {len(channel)} videos\n")
 
+    # A cached search may still list the very video that died, so repair
+    # always searches afresh (and refreshes the cache while it is at it).
+    searches = SearchCache()
     fixed, unfixed = [], []
     for track in dead:
         probe = {"title": track["title"], "duration": durations.get(match_key(track["title"]))}
-        vid = pick(channel, probe) or pick(search_youtube(f"{track['title']} {ARTIST_NAME}"), probe)
+        vid = pick(channel, probe) or searches.search_pick(
+            f"{track['title']} {ARTIST_NAME}", probe, refresh=True
+        )
         if vid:
             fixed.append((track, vid))
         else:
             unfixed.append(track)
+    searches.save()
 
     for track, vid in fixed:
         print(f"✅ {track['title']}")
@@ -347,36 +500,34 @@ def cmd_repair(music, apply):
         print(f"❔ {track['title']}  -- no replacement found, fix by hand")
         print(f"   dead url: {track.get('url')}")
 
-    if not apply:
-        print(f"\n(dry run -- {len(fixed)} repairable. Re-run with --apply to write.)")
-        return 0
-
-    for track, vid in fixed:
-        track["url"] = f"https://www.youtube.com/watch?v={vid['id']}"
-    MUSIC_JSON.write_text(
-        json.dumps(music, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
-    )
-    print(f"\n✅ Repaired {len(fixed)} URLs. {len(unfixed)} still need manual attention.")
-    print("Now run: python tools/download_audio.py")
-    return 0
+    if apply and fixed:
+        for track, vid in fixed:
+            track["url"] = f"https://www.youtube.com/watch?v={vid['id']}"
+        save_music(music)
+    return fixed, unfixed
 
 
 def cmd_verify(music):
     """Check that every URL already in music.json still resolves on YouTube."""
     print(f"Verifying {len(music)} existing URLs (this takes a minute)...\n")
-    dead = []
+    dead, unknown = [], []
     for i, track in enumerate(music, 1):
         url = track.get("url", "")
         if not url:
             dead.append((track, "no url"))
             continue
-        out = yt_dlp(["--skip-download", "--print", "%(id)s", url], timeout=90)
-        if not out.strip():
+        alive = url_alive(url)
+        if alive is False:
             dead.append((track, "unavailable"))
             print(f"  [{i}/{len(music)}] ❌ {track['title']}")
+        elif alive is None:
+            unknown.append(track)
+            print(f"  [{i}/{len(music)}] ⚠️  {track['title']} (could not check)")
         else:
             print(f"  [{i}/{len(music)}] ✅ {track['title']}", end="\r")
     print("\n")
+    if unknown:
+        print(f"⚠️  {len(unknown)} URLs could not be checked (offline or throttled?); re-run to retry them\n")
     if dead:
         print(f"❌ {len(dead)} broken:\n")
         for track, why in dead:
@@ -385,74 +536,94 @@ def cmd_verify(music):
             print(f"    url: {track.get('url')}")
         print("\nFix the url in music.json, delete the stale mp3 in public/audio/,")
         print("then re-run tools/download_audio.py.")
-    else:
+    elif not unknown:
         print("✅ All URLs resolve.")
-    return 1 if dead else 0
+    return 1 if dead or unknown else 0
 
 
-def main():
-    ap = argparse.ArgumentParser(
-        description="Sync music.json with the artist's latest releases."
-    )
-    ap.add_argument(
-        "--apply", action="store_true", help="write new entries to music.json"
-    )
-    ap.add_argument("--since", metavar="YYYY-MM-DD", help="only releases on/after this")
-    ap.add_argument(
-        "--verify", action="store_true", help="check existing URLs still resolve"
-    )
-    ap.add_argument(
-        "--repair",
-        action="store_true",
-        help="find replacement URLs for videos that have been taken down",
-    )
-    ap.add_argument(
-        "--no-search-fallback",
-        action="store_true",
-        help="channel listing only; skip the per-track YouTube search fallback",
-    )
-    args = ap.parse_args()
-
-    music = json.loads(MUSIC_JSON.read_text(encoding="utf-8"))
+def _report_channel(future):
+    if not future.exception():
+        print(f"   📺 channel listed: {len(future.result())} videos")
 
-    if args.verify:
-        return cmd_verify(music)
 
-    if args.repair:
-        return cmd_repair(music, args.apply)
+def cmd_sync(music, since=None, apply=False, search_fallback=True, refresh_search=()):
+    """
+    Find releases missing from music.json and match them to YouTube videos.
 
+    Prints the report; with apply, appends the confident matches to `music` and
+    writes music.json. Returns the list of entries added (empty on a dry run).
+    Titles in refresh_search bypass the search cache.
+    """
     have = {match_key(t["title"]) for t in music}
     have_ids = {t.get("id") for t in music}
 
     print(f"📚 music.json currently has {len(music)} tracks")
-    print(f"🔎 Fetching Deezer catalog{' since ' + args.since if args.since else ''}...")
-    catalog = fetch_deezer_catalog(since=args.since)
-    print(f"   {len(catalog)} distinct tracks released")
-
-    new = [t for t in catalog if match_key(t["title"]) not in have]
-    if not new:
-        print("\n✅ music.json is already up to date.")
-        return 0
-
-    print(f"   {len(new)} not in music.json\n")
-    print("📺 Listing the artist's YouTube channel...")
-    channel = fetch_channel_videos()
-    print(f"   {len(channel)} videos\n")
-
-    matched, unmatched = [], []
-    for track in new:
-        vid = pick(channel, track)
+    print(f"🔎 Fetching Deezer catalog{' since ' + since if since else ''}...\n")
+    searches = SearchCache()
+    refresh = {match_key(t) for t in refresh_search}
+
+    def resolve(track):
+        # Runs on a worker: waits for the channel listing (usually already
+        # done by the time Deezer yields anything new), then falls back to
+        # search, which also overlaps with the rest of the Deezer crawl.
+        vid = pick(channel.result(), track)
         source = "channel"
-        if not vid and not args.no_search_fallback:
+        if not vid and search_fallback:
             # Collabs are often hosted on the collaborator's channel. Try the
             # artist-qualified query first, then the bare title -- adding the
             # artist name can push an exactly-titled collab upload out of the
             # results entirely.
+            fresh = match_key(track["title"]) in refresh
             for query in (f"{track['title']} {ARTIST_NAME}", track["title"]):
-                vid = pick(search_youtube(query), track)
+                vid = searches.search_pick(query, track, refresh=fresh)
                 if vid:
                     break
             source = "search"
+        return vid, source
+
+    def report(done):
+        for fut in done:
+            vid, source = fut.result()
+            title = pending.pop(fut)["title"]
+            print(f"   {'✅' if vid else '❔'} {title}" + (f"  (via {source})" if vid else ""))
+
+    # Deezer and the channel listing are independent, so once the first new
+    # track turns up the listing runs alongside the rest of the crawl, and each
+    # new track is matched the moment both sides have it. The catalog is newest
+    # first, so that is usually straight away. With nothing new the listing is
+    # never started, and a routine sync (or daemon cycle) costs Deezer alone.
+    new, results, pending, released = [], {}, {}, 0
+    channel = None
+    durations = load_state("durations")
+    with ThreadPoolExecutor(max_workers=SYNC_WORKERS) as pool:
+        for track in iter_deezer_catalog(since=since):
+            released += 1
+            # Keep --repair's runtime table current for free while we're here.
+            durations[match_key(track["title"])] = track["duration"]
+            if match_key(track["title"]) in have:
+                continue
+            if channel is None:
+                print("📺 Listing the artist's YouTube channel in the background")
+                channel = pool.submit(fetch_channel_videos)
+                channel.add_done_callback(_report_channel)
+            fut = pool.submit(resolve, track)
+            results[len(new)] = fut
+            pending[fut] = track
+            new.append(track)
+            report([f for f in list(pending) if f.done()])
+        print(f"   {released} distinct tracks released, {len(new)} not in music.json")
+        save_state("durations", durations)
+        report(as_completed(list(pending)))
+    searches.save()
+
+    if not new:
+        print("\n✅ music.json is already up to date.")
+        return []
+
+    # Report and apply in catalog order (newest first), not completion order.
+    matched, unmatched = [], []
+    for i, track in enumerate(new):
+        vid, source = results[i].result()
         if vid:
             matched.append((track, vid, source))
         else:
@@ -477,36 +648,94 @@ def main():
         print(f"   runtime: {track['duration']}s")
         print("   no confident YouTube match -- add the url by hand if you want this one")
 
-    if not args.apply:
+    if not apply:
         print("\n(dry run -- nothing written. Re-run with --apply to add the matched tracks.)")
-        return 0
+        return []
 
-    added = 0
+    added = []
     for track, vid, _ in matched:
         slug = slugify(track["title"])
         if slug in have_ids:
             print(f"\n⚠️  Skipping '{track['title']}': id '{slug}' already exists.")
             continue
-        music.append(
-            {
-                "title": track["title"],
-                "url": f"https://www.youtube.com/watch?v={vid['id']}",
-                "art": track["art"],
-                "album": track["album"],
-                "id": slug,
-            }
-        )
+        entry = {
+            "title": track["title"],
+            "url": f"https://www.youtube.com/watch?v={vid['id']}",
+            "art": track["art"],
+            "album": track["album"],
+            "id": slug,
+        }
+        music.append(entry)
+        added.append(entry)
         have_ids.add(slug)
-        added += 1
 
-    MUSIC_JSON.write_text(
-        json.dumps(music, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    save_music(music)
+    print(f"\n✅ Added {len(added)} tracks. music.json now has {len(music)}.")
+    return added
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools sync",
+        description="Sync music.json with the artist's latest releases.",
+    )
+    ap.add_argument(
+        "--apply", action="store_true", help="write new entries to music.json"
+    )
+    ap.add_argument("--since", metavar="YYYY-MM-DD", help="only releases on/after this")
+    ap.add_argument(
+        "--verify", action="store_true", help="check existing URLs still resolve"
+    )
+    ap.add_argument(
+        "--repair",
+        action="store_true",
+        help="find replacement URLs for videos that have been taken down",
     )
-    print(f"\n✅ Added {added} tracks. music.json now has {len(music)}.")
-    print("\nNext:")
-    print("  1. python tools/download_audio.py     # fetch the new 32s clips")
-    print("  2. npm run dev                        # check it locally")
-    print("  3. vercel --prod                      # deploy WITH the audio files")
+    ap.add_argument(
+        "--full-crawl",
+        action="store_true",
+        help="with --repair: crawl every Deezer album for runtimes instead of "
+        "targeted lookups",
+    )
+    ap.add_argument(
+        "--no-search-fallback",
+        action="store_true",
+        help="channel listing only; skip the per-track YouTube search fallback",
+    )
+    ap.add_argument(
+        "--refresh-search",
+        action="append",
+        default=[],
+        metavar="TITLE",
+        help="ignore cached search results for this title (repeatable)",
+    )
+    args = ap.parse_args(argv)
+
+    if args.verify:
+        return cmd_verify(load_music())
+
+    # Everything below may rewrite music.json, so hold the write lock from the
+    # read to the write; a concurrent writer would otherwise be clobbered.
+    try:
+        with music_lock() if args.apply else contextlib.nullcontext():
+            music = load_music()
+            if args.repair:
+                return cmd_repair(music, args.apply, args.full_crawl)
+            added = cmd_sync(
+                music, args.since, args.apply, not args.no_search_fallback, args.refresh_search
+            )
+    except MusicLocked as e:
+        print(f"❌ {e}")
+        return 1
+
+    if added:
+        print("\nNext:")
+        print("  1. python -m tools songs              # rebuild the frontend song data")
+        print("  2. python tools/download_audio.py     # fetch the new clips")
+        print("  3. npm run dev                        # check it locally")
+        print("  4. python -m tools deploy             # see which clips changed")
+        print("  5. vercel --prod                      # deploy WITH the audio files")
+        print("  6. python -m tools deploy --mark-deployed")
     return 0
 
 
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Record/replay transport for the catalog tools.
+
+Every network touch in sync_music.py and download_audio.py goes through this
+module: Deezer API calls, yt-dlp subprocess runs, and yt-dlp source downloads.
+Normally it is a no-op pass-through. Two environment variables switch it into
+a mode that makes full pipeline runs reproducible and runnable offline:
+
+    HEARDLE_TRANSPORT=record:fixtures.zip   run live, and store every result
+    HEARDLE_TRANSPORT=replay:fixtures.zip   never touch the network; serve the
+                                            stored results instead
+    HEARDLE_LATENCY_MS=150                  replay only: sleep this long before
+                                            answering each call, to model a
+                                            network round trip (default 0)
+
+Results are keyed by what was asked for (the Deezer path, the yt-dlp argv, the
+download URL), so a replay is deterministic as long as the tool asks the same
+questions it asked while recording. A question with no recorded answer raises
+FixtureMissing rather than quietly degrading, because a benchmark that silently
+took a different code path is worse than no benchmark.
+
+Failures are recorded too: a download that errored while recording errors the
+same way on replay, so the failure-handling paths can be profiled as well.
+
+USAGE
+
+    # capture a full dry-run sync and a download pass
+    HEARDLE_TRANSPORT=record:bench.zip python tools/sync_music.py
+    HEARDLE_TRANSPORT=record:bench.zip python tools/download_audio.py
+
+    # replay them on a machine with no network, 100 ms per call
+    HEARDLE_TRANSPORT=replay:bench.zip HEARDLE_LATENCY_MS=100 python tools/sync_music.py
+
+When a mode is active, a one-line timing summary is printed on exit.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+_spec = os.environ.get("HEARDLE_TRANSPORT", "")
+MODE, _, ARCHIVE = _spec.partition(":")
+MODE = MODE.strip().lower() or "live"
+LATENCY = float(os.environ.get("HEARDLE_LATENCY_MS", "0") or 0) / 1000
+
+if MODE not in ("live", "record", "replay"):
+    sys.exit(f"❌ HEARDLE_TRANSPORT must be record:<file> or replay:<file>, got {_spec!r}")
+if MODE != "live" and not ARCHIVE:
+    sys.exit(f"❌ HEARDLE_TRANSPORT={_spec} needs an archive path, e.g. {MODE}:fixtures.zip")
+
+
+class FixtureMissing(RuntimeError):
+    """Replay was asked something that was never recorded."""
+
+
+class ReplayedDownloadError(Exception):
+    """A download that failed while recording, failing the same way on replay."""
+
+
+class Cancelled(Exception):
+    """A download abandoned by its caller (e.g. a losing hedged source).
+    Never recorded: it says nothing about whether the source works."""
+
+
+_lock = threading.Lock()
+_zip = None
+_stats = {"calls": 0, "waited": 0.0, "started": time.perf_counter()}
+
+
+def recording():
+    return MODE == "record"
+
+
+def replaying():
+    return MODE == "replay"
+
+
+def _archive():
+    """Open the fixture archive lazily, once. Caller must hold _lock."""
+    global _zip
+    if _zip is None:
+        import zipfile
+
+        _zip = zipfile.ZipFile(ARCHIVE, "a" if recording() else "r")
+    return _zip
+
+
+def _entry(kind, key):
+    digest = hashlib.sha1(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+    return f"{kind}/{digest[:20]}"
+
+
+def _store(name, payload):
+    with _lock:
+        z = _archive()
+        # First answer wins. A second identical question during the same
+        # recording would otherwise leave duplicate zip members behind.
+        if name not in z.NameToInfo:
+            z.writestr(name, payload)
+
+
+def _load(name, kind, key):
+    if LATENCY:
+        time.sleep(LATENCY)
+    with _lock:
+        _stats["calls"] += 1
+        _stats["waited"] += LATENCY
+        try:
+            return _archive().read(name)
+        except KeyError:
+            raise FixtureMissing(f"no recorded {kind} for {key!r} in {ARCHIVE}") from None
+
+
+def call(kind, key, live):
+    """
+    Return live(), or its recorded answer, depending on the mode.
+
+    `key` must be JSON-serializable and identify the question; `live()` must
+    return something JSON-serializable.
+    """
+    if MODE == "live":
+        return live()
+    name = _entry(kind, key) + ".json"
+    if replaying():
+        return json.loads(_load(name, kind, key))["result"]
+    result = live()
+    with _lock:
+        _stats["calls"] += 1
+    _store(name, json.dumps({"key": key, "result": result}, ensure_ascii=False))
+    return result
+
+
+def download_error_class():
+    """The exception type a failed download raises in the current mode."""
+    if replaying():
+        return ReplayedDownloadError
+    import yt_dlp
+
+    return yt_dlp.utils.DownloadError
+
+
+def ytdl_fetch(url, ydl_opts, dest):
+    """
+    Download url's audio with yt-dlp to `dest` plus whatever extension yt-dlp
+    picks. Returns (path, info) where info is {"acodec", "ext"}.
+
+    Recording stores the downloaded source bytes and info (or the error
+    message); replay writes those bytes back without importing yt-dlp at all,
+    so everything downstream of the fetch (cutting, encoding) still runs for
+    real and can be profiled.
+    """
+    name = _entry("download", url)
+    if replaying():
+        meta = json.loads(_load(name + ".json", "download", url))
+        if meta.get("error"):
+            raise ReplayedDownloadError(meta["error"])
+        info = meta["info"]
+        path = Path(f"{dest}.{info['ext']}")
+        with _lock:
+            z = _archive()
+            # No .bin means yt-dlp "succeeded" without producing the file;
+            # leave the path absent so the caller reports it the same way.
+            if name + ".bin" in z.NameToInfo:
+                path.write_bytes(z.read(name + ".bin"))
+        return path, info
+
+    import yt_dlp
+
+    try:
+        with yt_dlp.YoutubeDL(dict(ydl_opts, outtmpl=f"{dest}.%(ext)s")) as ydl:
+            raw = ydl.extract_info(url, download=True)
+    except Exception as e:
+        if recording() and not isinstance(e, Cancelled):
+            _store(name + ".json", json.dumps({"key": url, "error": str(e)}))
+        raise
+    info = {"acodec": raw.get("acodec"), "ext": raw.get("ext")}
+    path = Path(f"{dest}.{info['ext']}")
+    if recording():
+        with _lock:
+            _stats["calls"] += 1
+        if path.exists():
+            _store(name + ".bin", path.read_bytes())
+        _store(name + ".json", json.dumps({"key": url, "error": None, "info": info}))
+    return path, info
+
+
+@atexit.register
+def _summary():
+    if MODE == "live":
+        return
+    wall = time.perf_counter() - _stats["started"]
+    print(
+        f"\n⏱  {MODE}: {_stats['calls']} calls in {wall:.2f}s wall"
+        + (f" ({_stats['waited']:.2f}s injected latency)" if replaying() else "")
+        + f"  [{ARCHIVE}]",
+        file=sys.stderr,
+    )
+    if _zip is not None:
+        _zip.close()
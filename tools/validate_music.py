@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Sam Bowman Heardle - music.json Validator
+
+Checks music.json for the mistakes that break the game silently rather than
+loudly: a missing id or url, two entries sharing an id (one clip overwrites the
+other), an id that /api/audio will refuse, a track with no clip on disk, or a
+songs.json that was built from an older music.json.
+
+USAGE
+
+    python -m tools validate
+    python tools/validate_music.py
+
+Exits 1 if any error was found; warnings alone exit 0.
+"""
+
+import argparse
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/validate_music.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.common import (
+    AUDIO_DIR,
+    MUSIC_JSON,
+    SONGS_JSON,
+    find_clip,
+    load_music,
+    match_key,
+    slugify,
+    utf8_console,
+)
+
+# Must match the id check in api/audio.js; anything else is a guaranteed 400.
+API_ID = re.compile(r"^[a-zA-Z0-9-]+$")
+KNOWN_HOSTS = ("youtube.com", "youtu.be", "soundcloud.com")
+
+
+def check(music, audio_dir=AUDIO_DIR):
+    """Return (errors, warnings) as lists of human-readable strings."""
+    errors, warnings = [], []
+    ids = Counter(t.get("id") for t in music if t.get("id"))
+    keys = Counter(match_key(t.get("title", "")) for t in music)
+
+    for i, track in enumerate(music, 1):
+        title = track.get("title") or f"entry {i}"
+        for field in ("title", "url", "id", "album"):
+            if not track.get(field):
+                errors.append(f"{title}: missing '{field}'")
+
+        tid = track.get("id")
+        if tid:
+            if not API_ID.match(tid):
+                errors.append(f"{title}: id '{tid}' is rejected by /api/audio")
+            if ids[tid] > 1:
+                errors.append(f"{title}: id '{tid}' is used {ids[tid]} times")
+            if track.get("title") and tid != slugify(track["title"]):
+                warnings.append(f"{title}: id '{tid}' differs from slug '{slugify(track['title'])}'")
+            if audio_dir.is_dir() and not find_clip(tid, audio_dir):
+                warnings.append(f"{title}: no clip at public/audio/{tid}.mp3 or .m4a")
+
+        url = track.get("url", "")
+        if url and not any(h in url for h in KNOWN_HOSTS):
+            warnings.append(f"{title}: url is not YouTube or SoundCloud ({url})")
+        sources = track.get("sources", [])
+        if not isinstance(sources, list) or not all(isinstance(u, str) and u for u in sources):
+            errors.append(f"{title}: 'sources' must be a list of URLs")
+        else:
+            for alt in sources:
+                if not any(h in alt for h in KNOWN_HOSTS):
+                    warnings.append(f"{title}: source is not YouTube or SoundCloud ({alt})")
+        if track.get("title") and keys[match_key(track["title"])] > 1:
+            warnings.append(f"{title}: title looks like a duplicate of another entry")
+
+    return errors, warnings
+
+
+def check_songs_json():
+    """Warning for a songs.json out of date with music.json, or None."""
+    from tools.build_songs import source_hash
+
+    if not SONGS_JSON.exists():
+        return "src/settings/songs.json is missing: run python -m tools songs"
+    built = json.loads(SONGS_JSON.read_text(encoding="utf-8")).get("source")
+    if built != source_hash(MUSIC_JSON.read_bytes()):
+        return "src/settings/songs.json is older than music.json: run python -m tools songs"
+    return None
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools validate",
+        description="Check music.json for entries that would break the game.",
+    )
+    ap.parse_args(argv)
+    utf8_console()
+
+    music = load_music()
+    errors, warnings = check(music)
+    stale = check_songs_json()
+    if stale:
+        warnings.append(stale)
+    for msg in errors:
+        print(f"❌ {msg}")
+    for msg in warnings:
+        print(f"⚠️  {msg}")
+    print(f"\n{len(music)} entries: {len(errors)} errors, {len(warnings)} warnings")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
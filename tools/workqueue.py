@@ -0,0 +1,538 @@
+#!/usr/bin/env python3
+"""
+Sam Bowman Heardle - Work Queue
+
+Spreads verify and download runs over several worker processes, and over
+several machines, so no single IP carries a whole catalog's worth of YouTube
+requests. Jobs live in a SQLite file (tools/.cache/queue.sqlite by default):
+
+  enqueue   adds one job per music.json entry: a URL to verify, or a clip to
+            download. Adding a job that is already queued, running or waiting
+            to be merged does nothing, so enqueueing twice is harmless.
+  worker    leases one job at a time, runs it, and reports the result. A lease
+            is renewed while the job runs; if the worker dies, the lease lapses
+            and another worker picks the job up. A failed job is retried with
+            backoff, up to MAX_ATTEMPTS times. Only the current lease holder can
+            report a result, so a job's result is recorded exactly once.
+  merge     applies finished results on the coordinating machine: downloaded
+            clips are written to public/audio/ (the workers send the clip bytes
+            back through the queue), and dead URLs are reported, or with
+            --repair re-matched and written to music.json. A URL is only
+            reported dead when YouTube says so; a worker that could not check
+            (throttled, offline) fails the job so it is retried.
+  status    per-kind job counts and per-worker throughput (--watch to refresh).
+  run       the coordinator in one go: enqueue, start --workers local workers,
+            show live progress until the queue drains, then merge.
+
+Workers on other machines only need this repo and the queue file. Point them at
+a copy on shared storage with --db, e.g.
+
+    python -m tools queue --db /mnt/shared/heardle.sqlite worker
+
+The file must live on a filesystem with working POSIX locks (a local disk, or
+NFSv4/SMB with locking); SQLite's own locking keeps the workers apart.
+
+USAGE
+
+    python -m tools queue run verify --workers 4
+    python -m tools queue run download --workers 2
+    python -m tools queue status --watch 2
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+if __package__ in (None, ""):
+    # Run as a script (python tools/workqueue.py): make `tools` importable.
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tools.common import (
+    AUDIO_DIR,
+    CACHE_DIR,
+    PROJECT_ROOT,
+    MusicLocked,
+    find_clip,
+    load_music,
+    music_lock,
+    utf8_console,
+)
+
+DEFAULT_DB = CACHE_DIR / "queue.sqlite"
+KINDS = ("verify", "download")
+
+# A worker holds a job for LEASE_SECONDS at a time and renews the lease every
+# third of that while the job is running.
+LEASE_SECONDS = 120
+MAX_ATTEMPTS = 3
+RETRY_BACKOFF = 30  # seconds before the first retry; doubles each attempt
+
+# How often an idle worker looks for new jobs, and the window throughput is
+# measured over in `status`.
+POLL_SECONDS = 5
+RATE_WINDOW = 300
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    key         TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    state       TEXT NOT NULL DEFAULT 'queued',   -- queued, leased, done, failed
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    not_before  REAL NOT NULL DEFAULT 0,
+    worker      TEXT,
+    lease_until REAL,
+    started     REAL,
+    finished    REAL,
+    result      TEXT,
+    error       TEXT,
+    merged      INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (kind, key)
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, kind, not_before);
+CREATE TABLE IF NOT EXISTS files (
+    job  INTEGER PRIMARY KEY REFERENCES jobs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS workers (
+    name    TEXT PRIMARY KEY,
+    host    TEXT,
+    pid     INTEGER,
+    started REAL,
+    seen    REAL
+);
+"""
+
+
+# --- Queue -------------------------------------------------------------------
+
+
+def connect(path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Autocommit mode; every multi-statement change goes through transaction().
+    # No WAL: it needs shared memory, which a queue file on a network share
+    # cannot offer.
+    conn = sqlite3.connect(str(path), timeout=60, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+@contextlib.contextmanager
+def transaction(conn):
+    """BEGIN IMMEDIATE: take the write lock up front, so two workers can never
+    both read a job as free and then both claim it."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def enqueue(conn, kind, jobs):
+    """
+    Add (key, payload) jobs of one kind. Returns how many were new.
+
+    Merged jobs from an earlier round are cleared first and failed ones are
+    given a fresh set of attempts; anything queued, running or unmerged is left
+    exactly as it is.
+    """
+    with transaction(conn):
+        conn.execute("DELETE FROM jobs WHERE kind = ? AND merged = 1", (kind,))
+        conn.execute("DELETE FROM workers WHERE name NOT IN (SELECT worker FROM jobs WHERE worker IS NOT NULL)")
+        conn.execute(
+            "UPDATE jobs SET state = 'queued', attempts = 0, not_before = 0, error = NULL "
+            "WHERE kind = ? AND state = 'failed'",
+            (kind,),
+        )
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO jobs (kind, key, payload) VALUES (?, ?, ?)",
+            [(kind, key, json.dumps(payload)) for key, payload in jobs],
+        )
+        return conn.total_changes - before
+
+
+def lease(conn, worker, kinds):
+    """Claim the next ready job of one of `kinds` for `worker`, or None."""
+    now = time.time()
+    marks = ",".join("?" * len(kinds))
+    with transaction(conn):
+        # A lapsed lease on a job with no attempts left is a failure, not a retry.
+        conn.execute(
+            "UPDATE jobs SET state = 'failed', finished = ?, error = coalesce(error, 'lease expired') "
+            "WHERE state = 'leased' AND lease_until < ? AND attempts >= ?",
+            (now, now, MAX_ATTEMPTS),
+        )
+        job = conn.execute(
+            f"SELECT * FROM jobs WHERE kind IN ({marks}) AND ("
+            "(state = 'queued' AND not_before <= ?) OR (state = 'leased' AND lease_until < ?)"
+            ") ORDER BY id LIMIT 1",
+            (*kinds, now, now),
+        ).fetchone()
+        if job is None:
+            return None
+        conn.execute(
+            "UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, started = ?, "
+            "attempts = attempts + 1 WHERE id = ?",
+            (worker, now + LEASE_SECONDS, now, job["id"]),
+        )
+    return job
+
+
+def renew(conn, job_id, worker):
+    conn.execute(
+        "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+        (time.time() + LEASE_SECONDS, job_id, worker),
+    )
+
+
+def finish(conn, job_id, worker, result, file=None):
+    """
+    Record a job's result. Returns False (and records nothing) if `worker` no
+    longer holds the lease: the job was reclaimed and may already be done.
+    """
+    with transaction(conn):
+        cur = conn.execute(
+            "UPDATE jobs SET state = 'done', finished = ?, result = ?, error = NULL "
+            "WHERE id = ? AND worker = ? AND state = 'leased'",
+            (time.time(), json.dumps(result), job_id, worker),
+        )
+        if cur.rowcount and file:
+            conn.execute("INSERT OR REPLACE INTO files (job, name, data) VALUES (?, ?, ?)", (job_id, *file))
+        return bool(cur.rowcount)
+
+
+def fail(conn, job_id, worker, error):
+    """Requeue a failed job with backoff, or mark it failed for good."""
+    now = time.time()
+    with transaction(conn):
+        job = conn.execute(
+            "SELECT attempts FROM jobs WHERE id = ? AND worker = ? AND state = 'leased'", (job_id, worker)
+        ).fetchone()
+        if job is None:
+            return
+        if job["attempts"] >= MAX_ATTEMPTS:
+            conn.execute(
+                "UPDATE jobs SET state = 'failed', finished = ?, error = ? WHERE id = ?", (now, error, job_id)
+            )
+        else:
+            conn.execute(
+                "UPDATE jobs SET state = 'queued', finished = ?, error = ?, not_before = ? WHERE id = ?",
+                (now, error, now + RETRY_BACKOFF * 2 ** (job["attempts"] - 1), job_id),
+            )
+
+
+def heartbeat(conn, worker):
+    """Register `worker`, or note that it is still alive."""
+    now = time.time()
+    conn.execute(
+        "INSERT INTO workers (name, host, pid, started, seen) VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (name) DO UPDATE SET seen = excluded.seen",
+        (worker, socket.gethostname(), os.getpid(), now, now),
+    )
+
+
+def pending(conn, kinds=KINDS):
+    marks = ",".join("?" * len(kinds))
+    return conn.execute(
+        f"SELECT count(*) FROM jobs WHERE kind IN ({marks}) AND state IN ('queued', 'leased')", kinds
+    ).fetchone()[0]
+
+
+# --- Jobs --------------------------------------------------------------------
+
+
+def verify_jobs(music):
+    # The url is part of the key: a repaired entry is a new job, not a repeat.
+    return [(f"{t['id']} {t['url']}", {"id": t["id"], "url": t["url"], "title": t.get("title", "")})
+            for t in music if t.get("id") and t.get("url")]
+
+
+def download_jobs(music):
+    return [
+        (f"{t['id']} {t['url']}", {"id": t["id"], "url": t["url"], "sources": t.get("sources", [])})
+        for t in music
+        if t.get("id") and t.get("url") and not find_clip(t["id"])
+    ]
+
+
+def run_verify(payload):
+    from tools import sync_music
+
+    alive = sync_music.url_alive(payload["url"])
+    if alive is None:
+        # Offline or throttled, not a verdict on the video: fail the lease so
+        # the job is retried, after backoff, by whichever worker gets it next.
+        raise RuntimeError("could not check (offline or throttled?)")
+    return {"alive": alive}, None
+
+
+def run_download(payload):
+    """Download into a scratch folder and hand the clip back through the queue."""
+    from tools import download_audio
+
+    # The clip manifest entry comes back with the clip, for merge to record:
+    # workers never write clips.json themselves.
+    with tempfile.TemporaryDirectory(prefix="heardle-queue-") as tmp:
+        made = download_audio.download_audio(payload["url"], payload["id"], Path(tmp), payload["sources"])
+        if not made:
+            raise RuntimeError("download failed")
+        clip = find_clip(payload["id"], Path(tmp))
+        return {"name": clip.name, "clip": made}, (clip.name, clip.read_bytes())
+
+
+JOBS = {"verify": (verify_jobs, run_verify), "download": (download_jobs, run_download)}
+
+
+# --- Commands ----------------------------------------------------------------
+
+
+def cmd_enqueue(conn, kind):
+    jobs = JOBS[kind][0](load_music())
+    added = enqueue(conn, kind, jobs)
+    print(f"📥 {kind}: {len(jobs)} jobs, {added} new ({pending(conn, (kind,))} pending)")
+    return added
+
+
+def cmd_worker(db, name, kinds, exit_when_empty):
+    conn = connect(db)
+    heartbeat(conn, name)
+    print(f"👷 {name} working on {', '.join(kinds)} from {db}")
+
+    while True:
+        job = lease(conn, name, kinds)
+        heartbeat(conn, name)
+        if job is None:
+            if exit_when_empty and not pending(conn, kinds):
+                return 0
+            time.sleep(POLL_SECONDS)
+            continue
+
+        # Keep the lease alive from a second connection while the job runs.
+        done = threading.Event()
+
+        def keep_leased(job_id=job["id"]):
+            side = connect(db)
+            while not done.wait(LEASE_SECONDS / 3):
+                renew(side, job_id, name)
+            side.close()
+
+        renewer = threading.Thread(target=keep_leased, daemon=True)
+        renewer.start()
+        payload = json.loads(job["payload"])
+        print(f"\n▶️  {job['kind']} {payload['id']} (attempt {job['attempts'] + 1})")
+        try:
+            result, file = JOBS[job["kind"]][1](payload)
+        except Exception as e:
+            fail(conn, job["id"], name, str(e)[:200])
+            print(f"  ❌ {e}")
+        else:
+            if not finish(conn, job["id"], name, result, file):
+                print("  ⚠️  lease lost; another worker owns this job now")
+        finally:
+            done.set()
+            renewer.join()
+
+
+def status_lines(conn):
+    lines = []
+    counts = {}
+    for row in conn.execute("SELECT kind, state, merged, count(*) AS n FROM jobs GROUP BY kind, state, merged"):
+        by_state = counts.setdefault(row["kind"], {})
+        state = "merged" if row["merged"] else row["state"]
+        by_state[state] = by_state.get(state, 0) + row["n"]
+    for kind in KINDS:
+        c = counts.get(kind)
+        if c:
+            lines.append(f"{kind:<9}" + "".join(
+                f"{state} {c.get(state, 0):<6}" for state in ("queued", "leased", "done", "failed", "merged")
+            ))
+
+    now = time.time()
+    workers = conn.execute(
+        "SELECT w.name, w.host, w.seen, "
+        "  sum(j.state = 'done') AS finished, "
+        "  sum(j.state = 'failed') AS failed, "
+        "  sum(j.state = 'done' AND j.finished >= ?) AS recent "
+        "FROM workers w LEFT JOIN jobs j ON j.worker = w.name "
+        "GROUP BY w.name ORDER BY w.name",
+        (now - RATE_WINDOW,),
+    ).fetchall()
+    if workers:
+        lines.append(f"\n{'worker':<24}{'host':<16}{'done':>6}{'failed':>8}{'jobs/min':>10}  last seen")
+        for w in workers:
+            rate = (w["recent"] or 0) * 60 / RATE_WINDOW
+            lines.append(
+                f"{w['name'][:23]:<24}{(w['host'] or '')[:15]:<16}{w['finished'] or 0:>6}"
+                f"{w['failed'] or 0:>8}{rate:>10.1f}  {now - w['seen']:.0f}s ago"
+            )
+    return lines or ["(queue is empty)"]
+
+
+def cmd_status(conn, watch=None):
+    while True:
+        if watch and sys.stdout.isatty():
+            print("\x1b[H\x1b[J", end="")
+        print("\n".join(status_lines(conn)))
+        if not watch:
+            return 0
+        time.sleep(watch)
+
+
+def cmd_merge(conn, repair=False):
+    """Apply finished results locally. Returns 1 if any job failed for good."""
+    from tools.download_audio import record_clips
+
+    jobs = conn.execute("SELECT * FROM jobs WHERE state = 'done' AND merged = 0 ORDER BY id").fetchall()
+    dead, written, made = [], 0, {}
+    for job in jobs:
+        payload, result = json.loads(job["payload"]), json.loads(job["result"])
+        if job["kind"] == "verify" and not result["alive"]:
+            dead.append(payload)
+        elif job["kind"] == "download" and not find_clip(payload["id"]):
+            file = conn.execute("SELECT name, data FROM files WHERE job = ?", (job["id"],)).fetchone()
+            AUDIO_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = AUDIO_DIR / f".queue-{file['name']}"
+            tmp.write_bytes(file["data"])
+            tmp.replace(AUDIO_DIR / file["name"])
+            if result.get("clip"):
+                made[payload["id"]] = result["clip"]
+            written += 1
+    record_clips(made)
+    with transaction(conn):
+        conn.executemany("UPDATE jobs SET merged = 1 WHERE id = ?", [(job["id"],) for job in jobs])
+        # The clip bytes have been written out; no need to keep a second copy.
+        conn.execute("DELETE FROM files WHERE job IN (SELECT id FROM jobs WHERE merged = 1)")
+
+    print(f"🔀 Merged {len(jobs)} results: {written} clips written to {AUDIO_DIR}")
+    for track in dead:
+        print(f"  ❌ dead: {track['title']}  {track['url']}")
+    if dead and repair:
+        from tools import build_songs, sync_music
+
+        ids = {t["id"] for t in dead}
+        try:
+            with music_lock():
+                music = load_music()
+                fixed, _ = sync_music.repair_dead(music, [t for t in music if t.get("id") in ids], apply=True)
+                if fixed:
+                    build_songs.main(["--no-report"])
+        except MusicLocked as e:
+            print(f"❌ {e}")
+            return 1
+    elif dead:
+        print("  Re-run with --repair to find replacements, or: python -m tools repair --apply")
+
+    failed = conn.execute("SELECT kind, payload, error FROM jobs WHERE state = 'failed'").fetchall()
+    for job in failed:
+        print(f"  ⚠️  {job['kind']} {json.loads(job['payload'])['id']} failed {MAX_ATTEMPTS}x: {job['error']}")
+    return 1 if failed else 0
+
+
+def cmd_run(db, kind, workers, interval, repair):
+    conn = connect(db)
+    cmd_enqueue(conn, kind)
+    logs = CACHE_DIR / "queue-logs"
+    logs.mkdir(parents=True, exist_ok=True)
+    host = socket.gethostname().split(".")[0]
+    procs = []
+    for i in range(workers):
+        name = f"{host}-{os.getpid()}-{i + 1}"
+        with open(logs / f"{name}.log", "w", encoding="utf-8") as log:
+            procs.append(subprocess.Popen(
+                [sys.executable, "-m", "tools", "queue", "--db", str(db), "worker",
+                 "--kinds", kind, "--exit-when-empty", "--name", name],
+                cwd=PROJECT_ROOT, stdout=log, stderr=subprocess.STDOUT,
+            ))
+    print(f"🚀 {workers} local workers started (logs in {logs})")
+
+    # Remote workers may hold jobs after the local ones exit, so wait for the
+    # queue itself to drain.
+    try:
+        while pending(conn, (kind,)):
+            if all(p.poll() is not None for p in procs) and not conn.execute(
+                "SELECT 1 FROM jobs WHERE kind = ? AND state = 'leased'", (kind,)
+            ).fetchone():
+                # Everything left is waiting out a retry backoff, and no
+                # worker is left to pick it up.
+                break
+            if sys.stdout.isatty():
+                print("\x1b[H\x1b[J", end="")
+            print("\n".join(status_lines(conn)) + "\n")
+            time.sleep(interval)
+    finally:
+        for p in procs:
+            p.wait()
+    print("\n".join(status_lines(conn)) + "\n")
+    return cmd_merge(conn, repair)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="python -m tools queue",
+        description="Shard verify and download runs across worker processes and machines.",
+    )
+    ap.add_argument("--db", type=Path, default=DEFAULT_DB, help=f"queue file (default {DEFAULT_DB})")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("enqueue", help="add a job per music.json entry")
+    p.add_argument("kind", choices=KINDS)
+
+    p = sub.add_parser("worker", help="process jobs until stopped")
+    p.add_argument("--kinds", default=",".join(KINDS), help="comma-separated job kinds to take")
+    p.add_argument("--name", help="worker name shown in status (default host-pid)")
+    p.add_argument("--exit-when-empty", action="store_true", help="stop once nothing is pending")
+
+    p = sub.add_parser("status", help="show job counts and per-worker throughput")
+    p.add_argument("--watch", type=float, metavar="SECONDS", help="refresh every SECONDS")
+
+    p = sub.add_parser("merge", help="apply finished results to public/audio/ and music.json")
+    p.add_argument("--repair", action="store_true", help="re-match dead URLs and write the fixes")
+
+    p = sub.add_parser("run", help="enqueue, run local workers with live progress, then merge")
+    p.add_argument("kind", choices=KINDS)
+    p.add_argument("--workers", type=int, default=4, help="local worker processes (default 4)")
+    p.add_argument("--interval", type=float, default=2, help="seconds between progress updates")
+    p.add_argument("--repair", action="store_true", help="re-match dead URLs and write the fixes")
+
+    args = ap.parse_args(argv)
+    utf8_console()
+
+    if args.command == "worker":
+        kinds = tuple(k for k in args.kinds.split(",") if k in KINDS)
+        name = args.name or f"{socket.gethostname().split('.')[0]}-{os.getpid()}"
+        return cmd_worker(args.db, name, kinds, args.exit_when_empty)
+    if args.command == "run":
+        return cmd_run(args.db, args.kind, args.workers, args.interval, args.repair)
+
+    conn = connect(args.db)
+    if args.command == "enqueue":
+        cmd_enqueue(conn, args.kind)
+        return 0
+    if args.command == "status":
+        return cmd_status(conn, args.watch)
+    return cmd_merge(conn, args.repair)
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Stopped")
+        sys.exit(130)